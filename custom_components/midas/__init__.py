@@ -9,21 +9,38 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from homeassistant.helpers import config_validation as cv
+
 from .api import IntegrationMidasApiClient
 from .const import (
+    CONF_OFFSETS,
     CONF_PASSWORD,
     CONF_RATEIDS,
     CONF_USERNAME,
+    DEFAULT_OFFSETS,
+    DOMAIN,
     PLATFORMS,
 )
 from .coordinator import MidasDataUpdateCoordinator
 from .data import IntegrationMidasData
+from .history import HISTORY_MAX_AGE, async_get_history_importer
+from .services import async_setup_services
+from .storage import rate_store
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.typing import ConfigType
 
     from .data import IntegrationMidasConfigEntry
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the services, available even before an entry has loaded."""
+    async_setup_services(hass)
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
@@ -31,25 +48,38 @@ async def async_setup_entry(
     entry: IntegrationMidasConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
-    coordinator = MidasDataUpdateCoordinator(
+    client = IntegrationMidasApiClient(
         hass=hass,
-        client=IntegrationMidasApiClient(
-            hass=hass,
-            username=entry.data[CONF_USERNAME],
-            password=entry.data[CONF_PASSWORD],
-        ),
+        username=entry.data[CONF_USERNAME],
+        password=entry.data[CONF_PASSWORD],
     )
+    coordinator = MidasDataUpdateCoordinator(hass=hass, client=client)
     entry.runtime_data = IntegrationMidasData(
+        client=client,
         coordinator=coordinator,
         rate_ids=entry.data[CONF_RATEIDS],
+        offsets=entry.options.get(CONF_OFFSETS, DEFAULT_OFFSETS),
     )
 
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_restore():
+        # Serve the rates saved on the last run right away, don't hold up startup
+        #   waiting on the MIDAS server to check for newer ones
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} refresh"
+        )
+    else:
+        # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+        await coordinator.async_config_entry_first_refresh()
 
     # Call async_setup_entry for the provided platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Fill the long-term statistics with the price history of new rates, and of
+    #   the time since the last import when it is more than a day behind
+    importer = async_get_history_importer(hass)
+    for rate_id in entry.runtime_data.rate_ids:
+        importer.async_start(client, rate_id, max_age=HISTORY_MAX_AGE)
+
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
@@ -63,10 +93,17 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: IntegrationMidasConfigEntry,
+) -> None:
+    """Remove the saved rates of a deleted entry."""
+    await rate_store(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: IntegrationMidasConfigEntry,
 ) -> None:
     """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -2,15 +2,96 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import json
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
 
 from california_midasapi import Midas
+from california_midasapi.exception import MidasDecodingException, MidasException
+from california_midasapi.types import RateInfo, ValueInfoItem
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .auth import async_get_token_manager, credentials_key
+from .resilience import async_get_circuit_breaker, request_status
+
 if TYPE_CHECKING:
-    from california_midasapi.ratelist import RateInfo
+    from collections.abc import Awaitable, Callable
+    from datetime import date
+
     from homeassistant.core import HomeAssistant
 
+    from .auth import MidasTokenManager
+
+HISTORICAL_DATA_URL = "https://midasapi.energy.ca.gov/api/historicaldata"
+
+
+def parse_rate_info(text: str) -> RateInfo:
+    """Decode a rate the same way the MIDAS library does, runs in the executor."""
+
+    def _object_hook(item: dict[str, Any]) -> ValueInfoItem | RateInfo:
+        # Called for the rate and each of its tariffs
+        if "DateStart" in item:
+            return ValueInfoItem(**item)
+        if "RateID" in item:
+            return RateInfo(**item)
+        msg = "Invalid object type in rate data"
+        raise MidasDecodingException(msg)
+
+    return json.loads(text, object_hook=_object_hook)
+
+
+class _SharedTokenMidas(Midas):
+    """MIDAS library client that gets its tokens from the token manager."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        username: str,
+        password: str,
+        tokens: MidasTokenManager,
+    ) -> None:
+        """Initialize."""
+        super().__init__(async_get_clientsession(hass), username, password)
+        self.credentials_key = credentials_key(username, password)
+        self._tokens = tokens
+
+    @property
+    def auth_token(self) -> str | None:
+        """Token sent with requests."""
+        return self._MidasInternal__auth_token  # type: ignore[attr-defined]
+
+    async def _MidasInternal__loginAndStore(  # noqa: N802
+        self,
+        username: str,
+        password: str,
+    ) -> None:
+        """Take over the library's login, asking the token manager instead."""
+
+        async def _login() -> str:
+            await Midas._MidasInternal__loginAndStore(self, username, password)  # type: ignore[attr-defined]  # noqa: SLF001
+            return self._MidasInternal__auth_token  # type: ignore[attr-defined]
+
+        self._MidasInternal__auth_token = await self._tokens.async_get_token(
+            self.credentials_key, _login
+        )
+
+    async def get_historical_rate_data(
+        self, rate_id: str, start: date, end: date
+    ) -> str:
+        """Get the undecoded tariffs of a rate between two dates, both included."""
+        return await self._request(
+            "GET",
+            f"{HISTORICAL_DATA_URL}?id={rate_id}"
+            f"&startdate={start.isoformat()}&enddate={end.isoformat()}",
+        )
+
+    def discard_token(self) -> None:
+        """Drop the current token everywhere after the server rejected it."""
+        token = self.auth_token
+        if token is not None:
+            self._tokens.invalidate(self.credentials_key, token)
+            self._MidasInternal__auth_token = None
+
 
 class IntegrationMidasApiClient:
     """Midas API Client."""
@@ -23,11 +104,43 @@ class IntegrationMidasApiClient:
     ) -> None:
         """Midas API Client."""
         self._hass = hass
-        self._midas = Midas(async_get_clientsession(hass), username, password)
+        self._midas = _SharedTokenMidas(
+            hass, username, password, async_get_token_manager(hass)
+        )
+        self._breaker = async_get_circuit_breaker(hass)
 
     async def async_get_rate_data(self, rate_id: str) -> RateInfo:
-        """Get data from the API."""
-        return await self._midas.GetRateInfo(rate_id)
+        """Get data from the API, retrying while the server has trouble."""
+        return await self._breaker.async_call(
+            lambda: self._async_retry_unauthorized(
+                lambda: self._midas.GetRateInfo(rate_id)
+            )
+        )
+
+    async def async_get_historical_rate_data(
+        self, rate_id: str, start: date, end: date
+    ) -> RateInfo:
+        """Get the tariffs of a rate between two dates, both included."""
+        text = await self._breaker.async_call(
+            lambda: self._async_retry_unauthorized(
+                lambda: self._midas.get_historical_rate_data(rate_id, start, end)
+            )
+        )
+        # Months of real time prices are too much to decode in the event loop
+        return await self._hass.async_add_executor_job(parse_rate_info, text)
+
+    async def _async_retry_unauthorized[T](
+        self, request: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Make a request, once more with a new token if the token was rejected."""
+        try:
+            return await request()
+        except MidasException as exception:
+            # A saved token can be revoked before it expires, retry with a new one
+            if request_status(exception) != HTTPStatus.UNAUTHORIZED:
+                raise
+            self._midas.discard_token()
+            return await request()
 
     async def async_test_credentials(self) -> None:
         """Check for validity of the set credentials. Throws if invalid."""
@@ -0,0 +1,160 @@
+"""Login token management for MIDAS."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from datetime import timedelta
+from typing import TYPE_CHECKING, TypedDict
+
+import jwt
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+TOKEN_STORAGE_VERSION = 1
+# Tokens are reused until this close to expiring, then a new one is requested.
+#   Matches the margin the MIDAS library checks before every request
+TOKEN_REFRESH_MARGIN = timedelta(minutes=2)
+# Used when a token's expiry can't be read from it, what MIDAS documents
+TOKEN_LIFETIME = timedelta(minutes=10)
+
+DATA_TOKEN_MANAGER: HassKey[MidasTokenManager] = HassKey(f"{DOMAIN}_tokens")
+
+
+class StoredToken(TypedDict):
+    """A token as saved to disk."""
+
+    token: str
+    expires: str
+
+
+def async_get_token_manager(hass: HomeAssistant) -> MidasTokenManager:
+    """Get the token manager shared by every config entry and config flow."""
+    if DATA_TOKEN_MANAGER not in hass.data:
+        hass.data[DATA_TOKEN_MANAGER] = MidasTokenManager(hass)
+    return hass.data[DATA_TOKEN_MANAGER]
+
+
+def credentials_key(username: str, password: str) -> str:
+    """Get the key tokens of an account are stored under."""
+    # Includes the password so a token never vouches for credentials it wasn't
+    #   issued for, hashed so neither is written to disk in the clear
+    return hashlib.sha256(f"{username}\x00{password}".encode()).hexdigest()
+
+
+def token_expiry(token: str, issued: datetime) -> datetime:
+    """Get when a token expires, from its claims if they can be read."""
+    try:
+        claims = jwt.decode(
+            token, algorithms=["HS256"], options={"verify_signature": False}
+        )
+        return dt_util.utc_from_timestamp(claims["exp"])
+    except (jwt.InvalidTokenError, KeyError, TypeError, ValueError):
+        return issued + TOKEN_LIFETIME
+
+
+class MidasTokenManager:
+    """
+    Login tokens shared by everything talking to MIDAS.
+
+    A token is kept per account and handed to every client using that account, so
+    validating credentials in the config flow, the first refresh of the new entry
+    and every poll after reuse a single login while it's valid. Tokens are saved to
+    disk to survive restarts and replaced once they get close to expiring.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._store: Store[dict[str, StoredToken]] = Store(
+            hass, TOKEN_STORAGE_VERSION, f"{DOMAIN}.tokens", private=True
+        )
+        self._tokens: dict[str, tuple[str, datetime]] | None = None
+        self._load_lock = asyncio.Lock()
+        self._logins: dict[str, asyncio.Task[str]] = {}
+        self.logins = 0
+        """Number of logins made to the server."""
+        self.logins_avoided = 0
+        """Number of times a token was reused instead of logging in."""
+
+    async def async_get_token(
+        self,
+        key: str,
+        login: Callable[[], Awaitable[str]],
+    ) -> str:
+        """Get a valid token for an account, calling `login` if there isn't one."""
+        tokens = await self._async_load()
+        cached = tokens.get(key)
+        if cached is not None and cached[1] - dt_util.utcnow() > TOKEN_REFRESH_MARGIN:
+            self.logins_avoided += 1
+            return cached[0]
+
+        task = self._logins.get(key)
+        if task is None:
+            # Not started eagerly, it has to be registered as pending before it
+            #   can finish and remove itself
+            task = self._hass.async_create_task(
+                self._async_login(key, login),
+                f"{DOMAIN} login",
+                eager_start=False,
+            )
+            self._logins[key] = task
+        else:
+            # Join the login already in flight for the account
+            self.logins_avoided += 1
+        # Shielded so one client giving up doesn't cancel the login for the others
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: str, token: str) -> None:
+        """Forget a token the server rejected so the next request logs in again."""
+        if self._tokens is not None and self._tokens.get(key, (None,))[0] == token:
+            LOGGER.debug("Discarding MIDAS token rejected by the server")
+            del self._tokens[key]
+            self._store.async_delay_save(self._data_to_store)
+
+    async def _async_login(
+        self,
+        key: str,
+        login: Callable[[], Awaitable[str]],
+    ) -> str:
+        """Log in and keep the token."""
+        self.logins += 1
+        try:
+            token = await login()
+        finally:
+            del self._logins[key]
+        tokens = await self._async_load()
+        tokens[key] = (token, token_expiry(token, dt_util.utcnow()))
+        self._store.async_delay_save(self._data_to_store)
+        return token
+
+    async def _async_load(self) -> dict[str, tuple[str, datetime]]:
+        """Load the saved tokens the first time they're needed."""
+        async with self._load_lock:
+            if self._tokens is None:
+                stored = await self._store.async_load() or {}
+                now = dt_util.utcnow()
+                self._tokens = {}
+                for key, token in stored.items():
+                    expires = dt_util.parse_datetime(token["expires"])
+                    if expires is not None and expires > now:
+                        self._tokens[key] = (token["token"], expires)
+        return self._tokens
+
+    def _data_to_store(self) -> dict[str, StoredToken]:
+        """Get the tokens to save, leaving out the expired ones."""
+        now = dt_util.utcnow()
+        return {
+            key: {"token": token, "expires": expires.isoformat()}
+            for key, (token, expires) in (self._tokens or {}).items()
+            if expires > now
+        }
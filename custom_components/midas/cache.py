@@ -0,0 +1,101 @@
+"""Rate cache shared by every MIDAS config entry."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from datetime import datetime
+
+    from california_midasapi.types import RateInfo
+    from homeassistant.core import HomeAssistant
+
+# Shorter than the shortest poll interval so every refresh cycle gets new data
+RATE_CACHE_TTL = timedelta(minutes=5)
+
+DATA_RATE_CACHE: HassKey[MidasRateCache] = HassKey(f"{DOMAIN}_rate_cache")
+
+
+def async_get_rate_cache(hass: HomeAssistant) -> MidasRateCache:
+    """Get the rate cache shared by every config entry."""
+    if DATA_RATE_CACHE not in hass.data:
+        hass.data[DATA_RATE_CACHE] = MidasRateCache(hass)
+    return hass.data[DATA_RATE_CACHE]
+
+
+class MidasRateCache:
+    """
+    Recently fetched rates, shared by every config entry.
+
+    Entries watching the same rate id get the same response for `RATE_CACHE_TTL`
+    and join a fetch already in flight instead of starting their own, so each rate
+    is only requested once per refresh cycle no matter how many entries use it.
+    """
+
+    def __init__(self, hass: HomeAssistant, ttl: timedelta = RATE_CACHE_TTL) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._ttl = ttl
+        self._rates: dict[str, tuple[datetime, RateInfo]] = {}
+        self._pending: dict[str, asyncio.Task[RateInfo]] = {}
+        self.fetches = 0
+        """Number of requests made to the server."""
+        self.hits = 0
+        """Number of times a cached rate was served."""
+        self.coalesced = 0
+        """Number of times a fetch already in flight was joined."""
+
+    async def async_get(
+        self,
+        rate_id: str,
+        fetch: Callable[[], Awaitable[RateInfo]],
+    ) -> RateInfo:
+        """Get a rate, calling `fetch` if it isn't cached or being fetched already."""
+        cached = self._rates.get(rate_id)
+        if cached is not None and dt_util.utcnow() - cached[0] < self._ttl:
+            self.hits += 1
+            return cached[1]
+
+        task = self._pending.get(rate_id)
+        if task is None:
+            self.fetches += 1
+            # Not started eagerly, it has to be registered as pending before it
+            #   can finish and remove itself
+            task = self._hass.async_create_task(
+                self._async_fetch(rate_id, fetch),
+                f"{DOMAIN} fetch {rate_id}",
+                eager_start=False,
+            )
+            self._pending[rate_id] = task
+        else:
+            self.coalesced += 1
+        # Shielded so one entry giving up doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    def evict_expired(self) -> None:
+        """Drop every cached rate older than the TTL."""
+        now = dt_util.utcnow()
+        for rate_id, (fetched_at, _) in list(self._rates.items()):
+            if now - fetched_at >= self._ttl:
+                del self._rates[rate_id]
+
+    async def _async_fetch(
+        self,
+        rate_id: str,
+        fetch: Callable[[], Awaitable[RateInfo]],
+    ) -> RateInfo:
+        """Fetch a rate and cache it."""
+        try:
+            rate = await fetch()
+        finally:
+            del self._pending[rate_id]
+        self._rates[rate_id] = (dt_util.utcnow(), rate)
+        return rate
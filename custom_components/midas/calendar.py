@@ -0,0 +1,137 @@
+"""Calendar platform for the MIDAS integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.core import callback
+
+from .entity import MidasEntity
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from california_midasapi.types import ValueInfoItem
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+    from .coordinator import MidasDataUpdateCoordinator
+    from .data import IntegrationMidasConfigEntry
+    from .tariffs import ScheduleEntry
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    entry: IntegrationMidasConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the calendar platform."""
+    async_add_entities(
+        MidasTariffCalendar(
+            coordinator=entry.runtime_data.coordinator,
+            rate_id=rate_id,
+        )
+        for rate_id in entry.runtime_data.rate_ids
+    )
+
+
+def _make_event(entry: ScheduleEntry) -> CalendarEvent:
+    """Turn a tariff of a schedule into a calendar event."""
+    start, end, price, name = entry
+    return CalendarEvent(
+        start=start,
+        end=end,
+        summary=name,
+        description=f"{price} USD/kWh",
+    )
+
+
+class MidasTariffCalendar(MidasEntity, CalendarEntity):
+    """
+    MIDAS Tariff Calendar class.
+
+    Shows every tariff of a rate as an event. Events in a range are found with a
+    binary search of the tariff index the coordinator sorted after the last refresh.
+    """
+
+    _attr_translation_key = "tariffs"
+
+    # Tariff resolved for the next state write
+    _tariff: ValueInfoItem | None = None
+    _resolved_rate_available: bool = False
+
+    def __init__(
+        self,
+        coordinator: MidasDataUpdateCoordinator,
+        rate_id: str,
+    ) -> None:
+        """Initialize the calendar class."""
+        super().__init__(coordinator=coordinator, rate_id=rate_id)
+
+        self._attr_unique_id = f"{rate_id}_calendar"
+
+    async def async_added_to_hass(self) -> None:
+        """Callback for initial calendar creation, subscribes to tariff changeovers."""  # noqa: D401
+        await super().async_added_to_hass()
+        self._resolve_tariff()
+        self.async_on_remove(
+            self.coordinator.scheduler.async_subscribe(
+                self._rate_id, timedelta(), self._handle_tariff_change
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Resolve the tariff against the new data before writing the state."""
+        if (
+            self._rate_id not in self.coordinator.changed_rate_ids
+            and self._rate_available() == self._resolved_rate_available
+        ):
+            return
+        self._resolve_tariff()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _handle_tariff_change(self) -> None:
+        """Update the calendar right after the current tariff changed."""
+        self._resolve_tariff()
+        self.async_write_ha_state()
+
+    @callback
+    def _resolve_tariff(self) -> None:
+        """Look up the tariff that is the current event."""
+        self._resolved_rate_available = self._rate_available()
+        self._tariff = self.coordinator.active_tariff(self._rate_id, timedelta())
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the tariff active right now."""
+        if self._tariff is None:
+            return None
+        return _make_event(
+            (
+                self._tariff.GetStart(),
+                self._tariff.GetEnd(),
+                self._tariff.value,
+                self._tariff.ValueName,
+            )
+        )
+
+    async def async_get_events(
+        self,
+        hass: HomeAssistant,  # noqa: ARG002
+        start_date: datetime,
+        end_date: datetime,
+    ) -> list[CalendarEvent]:
+        """Return the tariffs active at some point between the dates."""
+        index = self.coordinator.tariff_indexes.get(self._rate_id)
+        if index is None:
+            return []
+        return [_make_event(entry) for entry in index.schedule(start_date, end_date)]
+
+    @property
+    def available(self) -> bool:
+        """Returns if the calendar is available."""
+        return self._rate_available()
@@ -13,6 +13,7 @@ from california_midasapi.exception import (
     MidasRegistrationException,
 )
 from homeassistant import config_entries, data_entry_flow
+from homeassistant.core import callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
@@ -21,17 +22,19 @@ from .api import IntegrationMidasApiClient
 from .const import (
     CONF_EMAIL,
     CONF_NAME,
+    CONF_OFFSETS,
     CONF_PASSWORD,
     CONF_RATEIDS,
     CONF_USERNAME,
     CONFIG_SCHEMA_AUTH,
+    CONFIG_SCHEMA_OFFSETS,
     CONFIG_SCHEMA_OPTIONS,
     CONFIG_SCHEMA_RECONFIGURE,
     CONFIG_SCHEMA_REGISTER,
+    DEFAULT_OFFSETS,
     DOMAIN,
     LOGGER,
 )
-from .sensor import SENSOR_DESCRIPTIONS
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -42,6 +45,14 @@ class MidasFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> MidasOptionsFlowHandler:
+        """Get the options flow for this handler."""
+        return MidasOptionsFlowHandler()
+
     async def async_step_user(
         self,
         user_input: dict | None = None,  # noqa: ARG002
@@ -218,7 +229,7 @@ class MidasFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 new_rateids = set(data[CONF_RATEIDS])
                 old_rateids = set(entry.data[CONF_RATEIDS])
                 for removed_rateid in old_rateids - new_rateids:
-                    await self._purge_registries_for_rateid(removed_rateid)
+                    await self._purge_registries_for_rateid(entry, removed_rateid)
                 # Update saved data and reload
                 self.hass.config_entries.async_update_entry(entry, data=data)
                 await self.hass.config_entries.async_setup(entry.entry_id)
@@ -258,25 +269,71 @@ class MidasFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 return True
         return False
 
-    async def _purge_registries_for_rateid(self, rate_id: str) -> None:
+    async def _purge_registries_for_rateid(
+        self, entry: config_entries.ConfigEntry, rate_id: str
+    ) -> None:
         """Remove devices and entities for the specified rate id."""
         LOGGER.debug(f"Purging entities and devices for rate id {rate_id}")
 
         device_registry = dr.async_get(self.hass)
         entity_registry = er.async_get(self.hass)
-        # remove entities
-        entity_uniqueids = [
-            entity_registry.async_get_entity_id(
-                DOMAIN, "sensor", entity.unique_id_fn(rate_id)
-            )
-            for entity in SENSOR_DESCRIPTIONS
-        ]
-        for entity_id in entity_uniqueids:
-            if entity_id is not None:
-                entity_registry.async_remove(entity_id)
+        # remove entities, every unique id of a rate starts with it
+        for entity in er.async_entries_for_config_entry(
+            entity_registry, entry.entry_id
+        ):
+            if entity.unique_id.startswith(f"{rate_id}_"):
+                entity_registry.async_remove(entity.entity_id)
         # remove devices
         device = device_registry.async_get_device(
             identifiers={(DOMAIN, rate_id)}  # defined in sensor.py
         )
         if device is not None:
             device_registry.async_remove_device(device.id)
+
+
+class MidasOptionsFlowHandler(config_entries.OptionsFlow):
+    """Options flow for MIDAS."""
+
+    async def async_step_init(
+        self,
+        user_input: dict | None = None,
+    ) -> data_entry_flow.FlowResult:
+        """Choose the lookahead offsets to create future price sensors for."""
+        _errors = {}
+        if user_input is not None:
+            offsets = self._parse_offsets(user_input.get(CONF_OFFSETS, []))
+            if offsets is None:
+                _errors["base"] = "offset_invalid"
+            else:
+                return self.async_create_entry(data={CONF_OFFSETS: offsets})
+        else:
+            offsets = self.config_entry.options.get(CONF_OFFSETS, DEFAULT_OFFSETS)
+            user_input = {CONF_OFFSETS: [self._format_offset(m) for m in offsets]}
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                CONFIG_SCHEMA_OFFSETS, user_input
+            ),
+            errors=_errors,
+        )
+
+    def _parse_offsets(self, offsets: list[str]) -> list[int] | None:
+        """
+        Parse offsets like `5m` or `4h` into a sorted list of minutes.
+
+        Returns None if any of them is invalid.
+        """
+        minutes: set[int] = set()
+        for offset in offsets:
+            match = re.match(r"^\s*(\d+)\s*([mh])\s*$", offset, re.IGNORECASE)
+            if match is None or int(match[1]) == 0:
+                return None
+            minutes.add(int(match[1]) * (60 if match[2].lower() == "h" else 1))
+        return sorted(minutes)
+
+    def _format_offset(self, minutes: int) -> str:
+        """Format an offset in minutes the way it's entered, like `5m` or `4h`."""
+        if minutes % 60 == 0:
+            return f"{minutes // 60}h"
+        return f"{minutes}m"
@@ -1,5 +1,6 @@
 """Constants for midas."""
 
+from datetime import timedelta
 from logging import Logger, getLogger
 
 import voluptuous as vol
@@ -19,11 +20,22 @@ ATTRIBUTION = "Data provided by https://midasapi.energy.ca.gov/"
 
 """Platforms provided by this integration."""
 PLATFORMS: list[Platform] = [
+    Platform.CALENDAR,
     Platform.SENSOR,
 ]
 
 # Config item variables
 CONF_RATEIDS = "rate_ids"
+CONF_OFFSETS = "offsets"
+
+# Lookahead offsets in minutes future price sensors are created for by default
+DEFAULT_OFFSETS = [15, 60]
+
+# Maximum number of rates requested from the MIDAS server at the same time
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+
+# How far ahead the forecast sensors list tariffs
+FORECAST_WINDOW = timedelta(hours=48)
 
 # Config schemas
 CONFIG_SCHEMA_REGISTER = vol.Schema(
@@ -85,3 +97,13 @@ CONFIG_SCHEMA_RECONFIGURE = vol.Schema(
         )
     }
 )
+
+CONFIG_SCHEMA_OFFSETS = vol.Schema(
+    {
+        vol.Optional(CONF_OFFSETS): selector.TextSelector(
+            selector.TextSelectorConfig(
+                type=selector.TextSelectorType.TEXT, multiple=True
+            )
+        )
+    }
+)
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+import time
 from typing import TYPE_CHECKING
 
 from california_midasapi.exception import MidasAuthenticationException, MidasException
@@ -10,16 +11,40 @@ from california_midasapi.types import RateInfo
 from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers import issue_registry
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, LOGGER
+from .cache import async_get_rate_cache
+from .const import DEFAULT_MAX_CONCURRENT_REQUESTS, DOMAIN, FORECAST_WINDOW, LOGGER
+from .metrics import (
+    REFRESH_AUTH_FAILED,
+    REFRESH_FAILED,
+    REFRESH_PARTIAL,
+    REFRESH_STALE,
+    REFRESH_SUCCESS,
+    MidasMetrics,
+)
+from .polling import MIN_POLL_INTERVAL, AdaptivePollingPolicy
+from .scheduler import TariffBoundaryScheduler
+from .storage import (
+    STORAGE_SAVE_DELAY,
+    rate_from_store,
+    rate_store,
+    rate_to_store,
+)
+from .tariffs import TariffIndex, rate_fingerprint
 
 if TYPE_CHECKING:
+    from datetime import datetime, timedelta
+
+    from california_midasapi.types import ValueInfoItem
     from homeassistant.core import HomeAssistant
 
     from .api import (
         IntegrationMidasApiClient,
     )
     from .data import IntegrationMidasConfigEntry
+    from .storage import StoredRates
+    from .tariffs import ScheduleEntry
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
@@ -32,54 +57,333 @@ class MidasDataUpdateCoordinator(DataUpdateCoordinator[dict[str, RateInfo]]):
         self,
         hass: HomeAssistant,
         client: IntegrationMidasApiClient,
+        max_concurrent_requests: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
     ) -> None:
         """Initialize."""
         self._client = client
+        self._rate_cache = async_get_rate_cache(hass)
+        self._max_concurrent_requests = max_concurrent_requests
+        self.failed_rate_ids: set[str] = set()
+        """Rate ids that failed to update on the last refresh, with no usable data."""
+        self.stale_rate_ids: set[str] = set()
+        """Rate ids that failed to update on the last refresh, served from the
+        previous data while its tariffs still cover the current time."""
+        self.tariff_indexes: dict[str, TariffIndex] = {}
+        """Lookup index for the tariffs of each rate, rebuilt when a rate changes."""
+        self.fingerprints: dict[str, str] = {}
+        """Fingerprint of the tariffs of each rate, see `rate_fingerprint`."""
+        self.change_counts: dict[str, int] = {}
+        """Number of times the tariffs of each rate changed, including the first."""
+        self.changed_rate_ids: set[str] = set()
+        """Rate ids whose tariffs changed on the last refresh."""
+        self.fetched_at: dict[str, datetime] = {}
+        """When each rate was last successfully fetched from the server."""
+        self.schedules: dict[str, tuple[ScheduleEntry, ...]] = {}
+        """Upcoming tariffs of each rate, rebuilt after every refresh."""
+        self.schedule_changed_rate_ids: set[str] = set()
+        """Rate ids whose schedule changed on the last refresh."""
+        self._restored_rate_ids: set[str] = set()
+        # Active tariff per rate and offset, with the span of time it's good for
+        self._active_tariffs: dict[
+            tuple[str, timedelta], tuple[float, float, ValueInfoItem | None]
+        ] = {}
+        self.scheduler = TariffBoundaryScheduler(
+            hass, lambda rate_id: self.tariff_indexes.get(rate_id)
+        )
+        """Updates entities right on their tariff changeovers."""
+        self._polling = AdaptivePollingPolicy()
+        self.next_refresh: datetime | None = None
+        """When the polling policy decided to get new data from the server."""
+        self.metrics = MidasMetrics()
+        """Timings and counters shown in the diagnostics."""
 
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            # Only get new data from the server at startup and every hour
-            update_interval=timedelta(hours=1),
-            always_update=True,
+            # Get new data from the server at startup, later polls are picked by
+            #   the polling policy after every refresh
+            update_interval=MIN_POLL_INTERVAL,
+            # Sensors are only updated when a rate's fingerprint changed
+            always_update=False,
         )
+        self._store = rate_store(hass, self.config_entry.entry_id)
+
+    async def async_restore(self) -> bool:
+        """
+        Serve the rates saved after the last successful refresh.
+
+        Returns True if every configured rate was restored, new data should then be
+        fetched in the background instead of waiting on the MIDAS server.
+        """
+        stored = await self._store.async_load()
+        if stored is None:
+            return False
+        rate_ids = self.config_entry.runtime_data.rate_ids
+        if any(rid not in stored["rates"] for rid in rate_ids):
+            return False
+
+        data: dict[str, RateInfo] = {}
+        for rid in rate_ids:
+            data[rid], fetched_at = rate_from_store(stored["rates"][rid])
+            if fetched_at is not None:
+                self.fetched_at[rid] = fetched_at
+            self.tariff_indexes[rid] = self._build_index(rid, data[rid])
+            self.fingerprints[rid] = rate_fingerprint(data[rid])
+        self._active_tariffs.clear()
+        self.changed_rate_ids = set(data)
+        self._restored_rate_ids = set(data)
+        self._build_schedules()
+        self.scheduler.async_reschedule()
+        LOGGER.debug(f"Restored saved data for rate IDs {rate_ids}")
+        self.async_set_updated_data(data)
+        return True
+
+    def active_tariff(self, rate_id: str, offset: timedelta) -> ValueInfoItem | None:
+        """
+        Get the tariff active `offset` from now for a rate.
+
+        The result is kept until the next tariff boundary, so all sensors of a rate
+        sharing an offset only search the index once per changeover.
+        """
+        timestamp = dt_util.utcnow().timestamp() + offset.total_seconds()
+        key = (rate_id, offset)
+        cached = self._active_tariffs.get(key)
+        if cached is not None and cached[0] <= timestamp < cached[1]:
+            return cached[2]
+        index = self.tariff_indexes.get(rate_id)
+        if index is None:
+            return None
+        time = dt_util.utc_from_timestamp(timestamp)
+        tariff = index.active_tariff(time)
+        if not index.is_boundary(time):
+            # Right on a boundary the tariff is different a moment later, only
+            #   keep it when it holds until the next one
+            boundary = index.next_boundary(time)
+            valid_until = float("inf") if boundary is None else boundary.timestamp()
+            self._active_tariffs[key] = (timestamp, valid_until, tariff)
+        return tariff
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled refresh and tariff changeover timers."""
+        await super().async_shutdown()
+        self.scheduler.async_shutdown()
 
     async def _async_update_data(self) -> dict[str, RateInfo]:
+        """Get the newsest set of rates, counting the outcome."""
+        try:
+            data = await self._async_update_rates()
+        except ConfigEntryAuthFailed:
+            self.metrics.record_refresh(REFRESH_AUTH_FAILED)
+            raise
+        except Exception:
+            self.metrics.record_refresh(REFRESH_FAILED)
+            raise
+        unfetched = len(self.failed_rate_ids) + len(self.stale_rate_ids)
+        if unfetched == 0:
+            self.metrics.record_refresh(REFRESH_SUCCESS)
+        elif unfetched == len(data):
+            self.metrics.record_refresh(REFRESH_STALE)
+        else:
+            self.metrics.record_refresh(REFRESH_PARTIAL)
+        return data
+
+    async def _async_update_rates(self) -> dict[str, RateInfo]:
         """Get the newsest set of rates."""
+        rate_ids = self.config_entry.runtime_data.rate_ids
+        self._rate_cache.evict_expired()
+        # Fetch every rate at once, limited so we don't flood the MIDAS server
+        semaphore = asyncio.Semaphore(self._max_concurrent_requests)
+        results = await asyncio.gather(
+            *(self._async_fetch_rate(rid, semaphore) for rid in rate_ids),
+            return_exceptions=True,
+        )
+
         data: dict[str, RateInfo] = {}
+        indexes: dict[str, TariffIndex] = {}
+        # Fingerprints of the rates that changed
+        fingerprints: dict[str, str] = {}
+        failed_rate_ids: set[str] = set()
+        stale_rate_ids: set[str] = set()
+        for rid, result in zip(rate_ids, results, strict=True):
+            if isinstance(result, MidasAuthenticationException):
+                raise ConfigEntryAuthFailed(result) from result
+            if isinstance(result, MidasException):
+                LOGGER.warning(f"Failed to get data for rate ID {rid}: {result}")
+                # Keep the last good data around for when the rate recovers
+                if self.data is not None and rid in self.data:
+                    data[rid] = self.data[rid]
+                    indexes[rid] = self.tariff_indexes[rid]
+                    if indexes[rid].active_tariff(dt_util.utcnow()) is not None:
+                        # Still good for now, the sensors go unavailable on their
+                        #   own once they run out of tariffs
+                        stale_rate_ids.add(rid)
+                        continue
+                failed_rate_ids.add(rid)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            self.fetched_at[rid] = dt_util.utcnow()
+            fingerprint = rate_fingerprint(result)
+            if self.fingerprints.get(rid) == fingerprint and rid in self.tariff_indexes:
+                # Same tariffs as last time, keep the already parsed ones. Handing
+                #   back the same objects also lets the coordinator see nothing
+                #   changed and skip updating the sensors.
+                data[rid] = self.data[rid]
+                indexes[rid] = self.tariff_indexes[rid]
+            else:
+                data[rid] = result
+                # Parse and sort the tariffs once so each sensor can find its
+                #   active tariff with a binary search
+                indexes[rid] = self._build_index(rid, result)
+                fingerprints[rid] = fingerprint
+                LOGGER.debug(f"Rate ID {rid} changed, fingerprint {fingerprint}")
+            self._check_active_tariffs(rid, indexes[rid])
+
+        if len(failed_rate_ids) == len(rate_ids):
+            self._set_next_refresh(MIN_POLL_INTERVAL)
+            msg = "Failed to get data for every rate ID"
+            raise UpdateFailed(msg)
+
+        self._apply_refresh(
+            data, indexes, fingerprints, failed_rate_ids, stale_rate_ids
+        )
+        return data
+
+    def _apply_refresh(
+        self,
+        data: dict[str, RateInfo],
+        indexes: dict[str, TariffIndex],
+        fingerprints: dict[str, str],
+        failed_rate_ids: set[str],
+        stale_rate_ids: set[str],
+    ) -> None:
+        """Keep the results of a successful refresh."""
+        previous_failed_rate_ids = self.failed_rate_ids
+        self.failed_rate_ids = failed_rate_ids
+        self.stale_rate_ids = stale_rate_ids
+        # Restored rates fetched again are no longer stale, update their sensors
+        #   even if nothing changed
+        revalidated_rate_ids = (
+            self._restored_rate_ids - failed_rate_ids - stale_rate_ids
+        )
+        self._restored_rate_ids -= revalidated_rate_ids
+        self.changed_rate_ids = set(fingerprints) | revalidated_rate_ids
+        for rid in fingerprints:
+            self.change_counts[rid] = self.change_counts.get(rid, 0) + 1
+        self.fingerprints = {
+            rid: fingerprints.get(rid, self.fingerprints.get(rid, "")) for rid in data
+        }
+        self.change_counts = {
+            rid: count for rid, count in self.change_counts.items() if rid in data
+        }
+        self.fetched_at = {
+            rid: fetched_at
+            for rid, fetched_at in self.fetched_at.items()
+            if rid in data
+        }
+        self.tariff_indexes = indexes
+        self._active_tariffs.clear()
+        self._build_schedules()
+        if len(fingerprints) > 0:
+            self.scheduler.async_reschedule()
+        elif (
+            len(self.changed_rate_ids) > 0
+            or len(self.schedule_changed_rate_ids) > 0
+            or failed_rate_ids != previous_failed_rate_ids
+        ):
+            # The data is the same so the coordinator won't update the sensors,
+            #   let them know they were revalidated, their availability changed or
+            #   time moved their schedule along
+            self.async_update_listeners()
+
+        now = dt_util.utcnow()
+        self._polling.forget(set(indexes))
+        self.metrics.forget(set(indexes))
+        for rid, index in indexes.items():
+            self._polling.observe(rid, index, now)
+        interval = self._polling.next_interval(now)
+        if len(failed_rate_ids) > 0 or len(stale_rate_ids) > 0:
+            # Try again soon, the circuit breaker keeps this from hammering a
+            #   server that is down
+            interval = min(interval, MIN_POLL_INTERVAL)
+        self._set_next_refresh(interval)
+        self._store.async_delay_save(self._data_to_store, STORAGE_SAVE_DELAY)
+
+    def _build_schedules(self) -> None:
+        """Collect the tariffs of each rate within the forecast window from now."""
+        now = dt_util.utcnow()
+        schedules: dict[str, tuple[ScheduleEntry, ...]] = {}
+        self.schedule_changed_rate_ids = set()
+        for rid, index in self.tariff_indexes.items():
+            schedule = index.schedule(now, now + FORECAST_WINDOW)
+            previous = self.schedules.get(rid)
+            if previous == schedule:
+                # Keep the same object so the forecast sensors can tell by identity
+                schedule = previous
+            else:
+                self.schedule_changed_rate_ids.add(rid)
+            schedules[rid] = schedule
+        self.schedules = schedules
+
+    def _data_to_store(self) -> StoredRates:
+        """Get the rates to save so they can be served right away on startup."""
+        return {
+            "rates": {
+                rid: rate_to_store(rate, self.fetched_at[rid])
+                for rid, rate in self.data.items()
+            }
+        }
+
+    def _set_next_refresh(self, interval: timedelta) -> None:
+        """Schedule the refresh after this one to happen `interval` from now."""
+        self.update_interval = interval
+        self.next_refresh = dt_util.utcnow() + interval
+        LOGGER.debug(f"Next MIDAS refresh at {self.next_refresh}")
+
+    async def _async_fetch_rate(
+        self, rate_id: str, semaphore: asyncio.Semaphore
+    ) -> RateInfo:
+        """Get the data for a single rate once a request slot is free."""
+        async with semaphore:
+            return await self._rate_cache.async_get(
+                rate_id, lambda: self._async_request_rate(rate_id)
+            )
+
+    async def _async_request_rate(self, rate_id: str) -> RateInfo:
+        """Get the data for a single rate from the server, timing the request."""
+        begin = time.perf_counter()
         try:
-            for rid in self.config_entry.runtime_data.rate_ids:
-                data[rid] = await self._client.async_get_rate_data(rid)
-                # Call GetCurrentTariffs to cache parsed start and end times
-                # Makes getting the active tariffs for each sensor much faster
-                tariffs = data[rid].GetCurrentTariffs()
-                # Check if there are any tariffs and issue error if not
-                if len(tariffs) == 0:
-                    issue_registry.async_create_issue(
-                        self.hass,
-                        DOMAIN,
-                        f"no_tarrifs_{rid.lower()}",
-                        is_fixable=False,
-                        is_persistent=False,
-                        severity=issue_registry.IssueSeverity.ERROR,
-                        translation_key="no_tariffs",
-                        translation_placeholders={"rid": rid},
-                    )
-                    LOGGER.debug(
-                        f"Rate ID {rid} has no active tariffs! An issue was created."
-                    )
-                else:
-                    issue_registry.async_delete_issue(
-                        self.hass,
-                        DOMAIN,
-                        f"no_tarrifs_{rid.lower()}",
-                    )
-        except MidasAuthenticationException as exception:
-            raise ConfigEntryAuthFailed(exception) from exception
-        except MidasException as exception:
-            raise UpdateFailed(exception) from exception
+            return await self._client.async_get_rate_data(rate_id)
+        finally:
+            self.metrics.record_fetch(rate_id, time.perf_counter() - begin)
+
+    def _build_index(self, rate_id: str, rate: RateInfo) -> TariffIndex:
+        """Parse and sort the tariffs of a rate, timing it."""
+        begin = time.perf_counter()
+        index = TariffIndex(rate)
+        self.metrics.record_index_build(rate_id, time.perf_counter() - begin)
+        return index
+
+    def _check_active_tariffs(self, rate_id: str, index: TariffIndex) -> None:
+        """Check if there are any tariffs and issue error if not."""
+        if len(index.active_tariffs(dt_util.now())) == 0:
+            issue_registry.async_create_issue(
+                self.hass,
+                DOMAIN,
+                f"no_tarrifs_{rate_id.lower()}",
+                is_fixable=False,
+                is_persistent=False,
+                severity=issue_registry.IssueSeverity.ERROR,
+                translation_key="no_tariffs",
+                translation_placeholders={"rid": rate_id},
+            )
+            LOGGER.debug(
+                f"Rate ID {rate_id} has no active tariffs! An issue was created."
+            )
         else:
-            # Update sensors immediately when we get new data
-            self.async_update_listeners()
-            return data
+            issue_registry.async_delete_issue(
+                self.hass,
+                DOMAIN,
+                f"no_tarrifs_{rate_id.lower()}",
+            )
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
 
+    from .api import IntegrationMidasApiClient
     from .coordinator import MidasDataUpdateCoordinator
 
 
@@ -18,5 +19,8 @@ type IntegrationMidasConfigEntry = ConfigEntry[IntegrationMidasData]
 class IntegrationMidasData:
     """Data for the MIDAS integration."""
 
+    client: IntegrationMidasApiClient
     coordinator: MidasDataUpdateCoordinator
     rate_ids: list[str]
+    offsets: list[int]
+    """Lookahead offsets in minutes to create future price sensors for."""
@@ -0,0 +1,69 @@
+"""Diagnostics support for the MIDAS integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .auth import async_get_token_manager
+from .cache import async_get_rate_cache
+from .const import CONF_PASSWORD, CONF_USERNAME
+from .resilience import async_get_circuit_breaker
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .data import IntegrationMidasConfigEntry
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant,
+    entry: IntegrationMidasConfigEntry,
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = entry.runtime_data.coordinator
+    rate_cache = async_get_rate_cache(hass)
+    token_manager = async_get_token_manager(hass)
+    circuit_breaker = async_get_circuit_breaker(hass)
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "rates": {
+            rid: {
+                "failed": rid in coordinator.failed_rate_ids,
+                "stale": rid in coordinator.stale_rate_ids,
+                "fetched_at": coordinator.fetched_at.get(rid),
+                "fingerprint": coordinator.fingerprints.get(rid),
+                "change_count": coordinator.change_counts.get(rid, 0),
+                "tariffs": len(coordinator.data[rid].ValueInformation)
+                if coordinator.data is not None and rid in coordinator.data
+                else None,
+            }
+            for rid in entry.runtime_data.rate_ids
+        },
+        "refresh": {
+            "last_update_success": coordinator.last_update_success,
+            "next_refresh": coordinator.next_refresh,
+        },
+        "timers": {
+            "tariff_changeovers": coordinator.scheduler.timer_count,
+            "pending_boundaries": coordinator.scheduler.pending_boundaries,
+        },
+        "circuit_breaker": {
+            "open": circuit_breaker.is_open,
+            "trips": circuit_breaker.trips,
+            "rejected": circuit_breaker.rejected,
+        },
+        "rate_cache": {
+            "fetches": rate_cache.fetches,
+            "hits": rate_cache.hits,
+            "coalesced": rate_cache.coalesced,
+        },
+        "tokens": {
+            "logins": token_manager.logins,
+            "logins_avoided": token_manager.logins_avoided,
+        },
+        "metrics": coordinator.metrics.as_dict(),
+    }
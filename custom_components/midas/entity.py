@@ -0,0 +1,56 @@
+"""Base entity for the MIDAS integration."""
+
+from __future__ import annotations
+
+import time
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import ATTRIBUTION, DOMAIN
+from .coordinator import MidasDataUpdateCoordinator
+
+
+class MidasEntity(CoordinatorEntity[MidasDataUpdateCoordinator]):
+    """
+    Base for the entities of a rate, grouped under a device per rate.
+
+    Counts and times its state writes in the coordinator's metrics.
+    """
+
+    _attr_has_entity_name = True
+    _attr_attribution = ATTRIBUTION
+
+    def __init__(
+        self,
+        coordinator: MidasDataUpdateCoordinator,
+        rate_id: str,
+    ) -> None:
+        """Initialize the entity class."""
+        super().__init__(coordinator=coordinator)
+
+        self._rate_id = rate_id
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._rate_id)},
+            name=self._rate_id,
+            manufacturer=None,
+            model=None,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine, timing it."""
+        begin = time.perf_counter()
+        super().async_write_ha_state()
+        self.coordinator.metrics.record_state_write(
+            self.entity_id, time.perf_counter() - begin
+        )
+
+    def _rate_available(self) -> bool:
+        """Return if the latest data for this entity's rate is usable."""
+        return (
+            super().available and self._rate_id not in self.coordinator.failed_rate_ids
+        )
@@ -0,0 +1,205 @@
+"""Import of historical MIDAS prices into long-term statistics."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from california_midasapi.exception import MidasException
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, LOGGER
+from .tariffs import TariffIndex
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from california_midasapi.types import RateInfo
+    from homeassistant.core import HomeAssistant
+
+    from .api import IntegrationMidasApiClient
+
+# Days of history requested and imported at a time, the most held in memory
+HISTORY_BATCH_DAYS = 30
+# How far back an import goes when not told where to start
+HISTORY_IMPORT_DAYS = 365
+# Automatic imports are skipped while the statistics are more recent than this
+HISTORY_MAX_AGE = timedelta(days=1)
+
+DATA_HISTORY_IMPORTER: HassKey[MidasHistoryImporter] = HassKey(
+    f"{DOMAIN}_history_importer"
+)
+
+
+def async_get_history_importer(hass: HomeAssistant) -> MidasHistoryImporter:
+    """Get the history importer shared by every config entry."""
+    if DATA_HISTORY_IMPORTER not in hass.data:
+        hass.data[DATA_HISTORY_IMPORTER] = MidasHistoryImporter(hass)
+    return hass.data[DATA_HISTORY_IMPORTER]
+
+
+def statistic_id(rate_id: str) -> str:
+    """Get the id of the external statistic holding a rate's price history."""
+    return f"{DOMAIN}:{slugify(rate_id)}_price"
+
+
+def hourly_statistics(
+    rate: RateInfo, start: datetime, end: datetime
+) -> list[StatisticData]:
+    """
+    Get the time weighted mean, minimum and maximum price of every hour of a rate.
+
+    Only hours between `start` and `end` with a tariff for at least part of the
+    hour are included. `start` has to be on the hour. Runs in the executor.
+    """
+    segments = TariffIndex(rate).price_segments(start, end)
+    statistics: list[StatisticData] = []
+    i = 0
+    hour = start
+    while hour < end:
+        hour_start = hour.timestamp()
+        hour_end = hour_start + 3600
+        while i < len(segments) and segments[i][1] <= hour_start:
+            i += 1
+        covered = 0.0
+        cost = 0.0
+        prices: list[float] = []
+        j = i
+        while j < len(segments) and segments[j][0] < hour_end:
+            overlap = min(hour_end, segments[j][1]) - max(hour_start, segments[j][0])
+            covered += overlap
+            cost += overlap * segments[j][2]
+            prices.append(segments[j][2])
+            j += 1
+        if covered > 0:
+            statistics.append(
+                StatisticData(
+                    start=hour,
+                    mean=cost / covered,
+                    min=min(prices),
+                    max=max(prices),
+                )
+            )
+        hour += timedelta(hours=1)
+    return statistics
+
+
+class MidasHistoryImporter:
+    """
+    Imports the price history of rates into the recorder's long-term statistics.
+
+    History is fetched from MIDAS and handed to the recorder `HISTORY_BATCH_DAYS`
+    at a time, waiting for each batch to be written before fetching the next, so
+    years of real time prices never have to be held in memory at once. Decoding
+    and averaging run in the executor. Imports continue from the hour after the
+    last one already imported, so an interrupted import picks up where it stopped.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._imports: dict[str, asyncio.Task[int]] = {}
+
+    @callback
+    def async_start(
+        self,
+        client: IntegrationMidasApiClient,
+        rate_id: str,
+        start: datetime | None = None,
+        *,
+        max_age: timedelta = timedelta(0),
+    ) -> asyncio.Task[int]:
+        """
+        Start importing the history of a rate, or join the import already running.
+
+        Skipped when the last imported hour is less than `max_age` old. The task
+        returns the number of hours imported.
+        """
+        task = self._imports.get(rate_id)
+        if task is None or task.done():
+            task = self._hass.async_create_background_task(
+                self._async_import(client, rate_id, start, max_age),
+                f"{DOMAIN} history import {rate_id}",
+            )
+            self._imports[rate_id] = task
+        return task
+
+    async def _async_import(
+        self,
+        client: IntegrationMidasApiClient,
+        rate_id: str,
+        start: datetime | None,
+        max_age: timedelta,
+    ) -> int:
+        """Import the history of a rate up to the current hour."""
+        if "recorder" not in self._hass.config.components:
+            LOGGER.debug(f"Not importing history of {rate_id}, no recorder")
+            return 0
+
+        now = dt_util.utcnow().replace(minute=0, second=0, microsecond=0)
+        statistic = statistic_id(rate_id)
+        last = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics,
+            self._hass,
+            1,
+            statistic,
+            False,  # noqa: FBT003 Convert units
+            {"mean"},
+        )
+        if start is None:
+            start = now - timedelta(days=HISTORY_IMPORT_DAYS)
+        start = dt_util.as_utc(start).replace(minute=0, second=0, microsecond=0)
+        if last.get(statistic):
+            # Resume after the last hour imported
+            resume = datetime.fromtimestamp(last[statistic][0]["start"], UTC)
+            if now - resume < max_age:
+                return 0
+            start = max(start, resume + timedelta(hours=1))
+
+        metadata = StatisticMetaData(
+            mean_type=StatisticMeanType.ARITHMETIC,
+            has_sum=False,
+            name=f"{rate_id} price",
+            source=DOMAIN,
+            statistic_id=statistic,
+            unit_of_measurement="USD/kWh",
+        )
+        imported = 0
+        batch_start = start
+        while batch_start < now:
+            batch_end = min(batch_start + timedelta(days=HISTORY_BATCH_DAYS), now)
+            try:
+                rate = await client.async_get_historical_rate_data(
+                    rate_id, batch_start.date(), batch_end.date()
+                )
+            except MidasException as exception:
+                LOGGER.warning(
+                    f"Stopped importing history of {rate_id} at {batch_start}, "
+                    f"will resume from there next time: {exception}"
+                )
+                break
+            statistics = await self._hass.async_add_executor_job(
+                hourly_statistics, rate, batch_start, batch_end
+            )
+            if statistics:
+                async_add_external_statistics(self._hass, metadata, statistics)
+                imported += len(statistics)
+                # Let the recorder write this batch before fetching the next one
+                await get_instance(self._hass).async_block_till_done()
+            batch_start = batch_end
+
+        LOGGER.debug(f"Imported {imported} hours of history of {rate_id}")
+        return imported
@@ -0,0 +1,146 @@
+"""Performance metrics of the MIDAS integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import callback
+
+if TYPE_CHECKING:
+    from homeassistant.core import CALLBACK_TYPE
+
+# Upper bounds of the fetch latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REFRESH_SUCCESS = "success"
+REFRESH_PARTIAL = "partial"
+# Every rate failed to update, but their previous data was still good to serve
+REFRESH_STALE = "stale"
+REFRESH_FAILED = "failed"
+REFRESH_AUTH_FAILED = "auth_failed"
+
+
+class LatencyHistogram:
+    """Counts of durations by bucket, with their total and the latest one."""
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize."""
+        self._bounds = bounds
+        # One more bucket for durations over the last bound
+        self._counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.last: float | None = None
+
+    def record(self, seconds: float) -> None:
+        """Count a duration."""
+        self._counts[bisect_left(self._bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+
+    @property
+    def mean(self) -> float | None:
+        """Return the average duration."""
+        return self.total / self.count if self.count > 0 else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the histogram in a form that can be shown as JSON."""
+        labels = [f"<={bound}" for bound in self._bounds]
+        labels.append(f">{self._bounds[-1]}")
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.mean,
+            "last": self.last,
+            "buckets": dict(zip(labels, self._counts, strict=True)),
+        }
+
+
+class MidasMetrics:
+    """
+    Timings and counters of a coordinator and its entities.
+
+    Only kept in memory, they're shown in the diagnostics and the diagnostic sensors
+    so it can be seen where time goes without attaching a profiler. Durations are
+    in seconds, measured with `time.perf_counter`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.fetch_latency: dict[str, LatencyHistogram] = {}
+        """Time taken by each request for a rate's data, failed ones included."""
+        self.index_build_time: dict[str, float] = {}
+        """Time taken to parse and sort the tariffs of each rate, last time."""
+        self.refresh_outcomes: Counter[str] = Counter()
+        """Number of refreshes by outcome, see the `REFRESH_*` constants."""
+        self.last_refresh_outcome: str | None = None
+        self.state_writes: Counter[str] = Counter()
+        """Number of state writes of each entity."""
+        self.state_write_time: Counter[str] = Counter()
+        """Event loop time spent writing the state of each entity, which is mostly
+        evaluating its state and attribute properties."""
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    def record_fetch(self, rate_id: str, seconds: float) -> None:
+        """Count a request for a rate's data."""
+        if rate_id not in self.fetch_latency:
+            self.fetch_latency[rate_id] = LatencyHistogram()
+        self.fetch_latency[rate_id].record(seconds)
+
+    def record_index_build(self, rate_id: str, seconds: float) -> None:
+        """Keep the time taken to index the tariffs of a rate."""
+        self.index_build_time[rate_id] = seconds
+
+    def record_refresh(self, outcome: str) -> None:
+        """Count a refresh."""
+        self.refresh_outcomes[outcome] += 1
+        self.last_refresh_outcome = outcome
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    @callback
+    def async_subscribe(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call `update_callback` after every refresh, failed ones included."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the subscription."""
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def record_state_write(self, entity_id: str, seconds: float) -> None:
+        """Count a state write of an entity."""
+        self.state_writes[entity_id] += 1
+        self.state_write_time[entity_id] += seconds
+
+    def forget(self, rate_ids: set[str]) -> None:
+        """Drop the metrics of rates that are no longer configured."""
+        self.fetch_latency = {
+            rid: histogram
+            for rid, histogram in self.fetch_latency.items()
+            if rid in rate_ids
+        }
+        self.index_build_time = {
+            rid: seconds
+            for rid, seconds in self.index_build_time.items()
+            if rid in rate_ids
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Get the metrics in a form that can be shown as JSON."""
+        return {
+            "fetch_latency": {
+                rid: histogram.as_dict()
+                for rid, histogram in self.fetch_latency.items()
+            },
+            "index_build_time": dict(self.index_build_time),
+            "refresh_outcomes": dict(self.refresh_outcomes),
+            "last_refresh_outcome": self.last_refresh_outcome,
+            "state_writes": dict(self.state_writes),
+            "state_write_time": dict(self.state_write_time),
+        }
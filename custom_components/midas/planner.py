@@ -0,0 +1,163 @@
+"""Deferrable load planner for MIDAS."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .tariffs import PriceSegment
+
+# Times the planner goes over every load looking for a cheaper spot for it
+MAX_REPAIR_PASSES = 4
+
+
+@dataclass(frozen=True, kw_only=True)
+class DeferrableLoad:
+    """A load to run once, uninterrupted, somewhere in the planning grid."""
+
+    name: str
+    power: float
+    """Power drawn while running, in kW."""
+    slots: int
+    """Number of grid slots the load runs for."""
+    deadline: int
+    """Slot the load has to be done by, exclusive."""
+
+
+def slot_prices(
+    segments: list[PriceSegment],
+    start: float,
+    slot_length: float,
+    count: int,
+) -> list[float | None]:
+    """
+    Get the average price of each slot of a grid, None where it isn't fully known.
+
+    `segments` have to be sorted and can't overlap.
+    """
+    prices: list[float | None] = []
+    i = 0
+    for slot in range(count):
+        slot_start = start + slot * slot_length
+        slot_end = slot_start + slot_length
+        while i < len(segments) and segments[i][1] <= slot_start:
+            i += 1
+        covered = 0.0
+        cost = 0.0
+        j = i
+        while j < len(segments) and segments[j][0] < slot_end:
+            overlap = min(slot_end, segments[j][1]) - max(slot_start, segments[j][0])
+            covered += overlap
+            cost += overlap * segments[j][2]
+            j += 1
+        # Allow for rounding of the timestamps
+        prices.append(cost / covered if covered >= slot_length - 1e-6 else None)
+    return prices
+
+
+class LoadPlanner:
+    """
+    Places deferrable loads on a grid of time slots at the lowest total cost.
+
+    Loads are placed greedily, the least flexible first, each at the cheapest start
+    that keeps the household under its power limit. Repair passes then take each
+    load out again and move it if a cheaper start opened up, and retry the loads
+    that didn't fit, until nothing improves. Each placement looks at every start
+    in a single sweep, using prefix sums for the cost of the slots a load covers
+    and a sliding window maximum for the power already used in them.
+    """
+
+    def __init__(
+        self,
+        prices: list[float | None],
+        slot_hours: float,
+        power_limit: float | None = None,
+    ) -> None:
+        """Initialize."""
+        self._slot_hours = slot_hours
+        self._power_limit = float("inf") if power_limit is None else power_limit
+        self._usage = [0.0] * len(prices)
+        # Cost of a kW over every slot up to each slot, and the number of slots
+        #   without a price up to each slot
+        self._prefix_cost = [0.0]
+        self._prefix_unknown = [0]
+        for price in prices:
+            self._prefix_cost.append(
+                self._prefix_cost[-1] + (price or 0.0) * slot_hours
+            )
+            self._prefix_unknown.append(self._prefix_unknown[-1] + (price is None))
+
+    def plan(self, loads: list[DeferrableLoad]) -> dict[str, int]:
+        """Get the start slot of every load that fits, by name."""
+        starts: dict[str, int] = {}
+        # Least room to move first
+        pending = sorted(
+            loads, key=lambda load: (load.deadline - load.slots, -load.power)
+        )
+        for _ in range(MAX_REPAIR_PASSES + 1):
+            improved = False
+            for load in pending:
+                start = self._best_start(load)
+                if start is not None:
+                    self._place(load, start)
+                    starts[load.name] = start
+                    improved = True
+            pending = [load for load in pending if load.name not in starts]
+
+            for load in loads:
+                if load.name not in starts:
+                    continue
+                current = starts[load.name]
+                self._place(load, current, -1)
+                start = self._best_start(load)
+                if start is not None and self.cost(load, start) < self.cost(
+                    load, current
+                ):
+                    current = start
+                    improved = True
+                self._place(load, current)
+                starts[load.name] = current
+            if not improved:
+                break
+        return starts
+
+    def cost(self, load: DeferrableLoad, start: int) -> float:
+        """Get the cost of running a load from the start slot."""
+        return load.power * (
+            self._prefix_cost[start + load.slots] - self._prefix_cost[start]
+        )
+
+    def _place(self, load: DeferrableLoad, start: int, sign: int = 1) -> None:
+        """Add the power of a load to the slots it runs in, or remove it."""
+        for slot in range(start, start + load.slots):
+            self._usage[slot] += sign * load.power
+
+    def _best_start(self, load: DeferrableLoad) -> int | None:
+        """Find the cheapest start that fits, the earliest of equally cheap ones."""
+        last_start = min(load.deadline, len(self._usage)) - load.slots
+        headroom = self._power_limit - load.power
+        best: int | None = None
+        best_cost = float("inf")
+        # Slots of the current window, with their usage decreasing from the front
+        window: deque[int] = deque()
+        for end in range(last_start + load.slots):
+            while window and self._usage[window[-1]] <= self._usage[end]:
+                window.pop()
+            window.append(end)
+            start = end - load.slots + 1
+            if start < 0:
+                continue
+            while window[0] < start:
+                window.popleft()
+            if (
+                self._usage[window[0]] > headroom + 1e-9
+                or self._prefix_unknown[end + 1] != self._prefix_unknown[start]
+            ):
+                continue
+            cost = self.cost(load, start)
+            if cost < best_cost - 1e-12:
+                best = start
+                best_cost = cost
+        return best
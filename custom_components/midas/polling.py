@@ -0,0 +1,74 @@
+"""Adaptive polling policy for MIDAS."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import timedelta
+from itertools import pairwise
+from statistics import median
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from .tariffs import TariffIndex
+
+MIN_POLL_INTERVAL = timedelta(minutes=15)
+MAX_POLL_INTERVAL = timedelta(hours=12)
+# How long after an expected publication to poll, gives the utility some slack
+PUBLICATION_GRACE = timedelta(minutes=15)
+# Number of publications remembered per rate to estimate its cadence
+PUBLICATION_HISTORY = 8
+
+
+class AdaptivePollingPolicy:
+    """
+    Decides when MIDAS should be polled next.
+
+    Static time of use rates usually publish months of tariffs at once while day
+    ahead and real time rates only reach hours into the future. Every rate is
+    polled before its data runs out and, once the cadence a rate publishes new
+    tariffs at is known, right after its next publication is expected.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._horizons: dict[str, datetime] = {}
+        self._publications: dict[str, deque[datetime]] = {}
+
+    def observe(self, rate_id: str, index: TariffIndex, now: datetime) -> None:
+        """Record the data of a rate, noting a publication if it reaches further."""
+        horizon = index.horizon
+        if horizon is None:
+            return
+        previous = self._horizons.get(rate_id)
+        if previous is None or horizon > previous:
+            self._publications.setdefault(
+                rate_id, deque(maxlen=PUBLICATION_HISTORY)
+            ).append(now)
+        self._horizons[rate_id] = horizon
+
+    def forget(self, rate_ids: set[str]) -> None:
+        """Drop the history of every rate not in `rate_ids`."""
+        for rate_id in set(self._horizons) - rate_ids:
+            del self._horizons[rate_id]
+            self._publications.pop(rate_id, None)
+
+    def cadence(self, rate_id: str) -> timedelta | None:
+        """Get the typical time between publications of a rate, if known."""
+        publications = self._publications.get(rate_id)
+        if publications is None or len(publications) < 2:  # noqa: PLR2004
+            return None
+        return median(b - a for a, b in pairwise(publications))
+
+    def next_interval(self, now: datetime) -> timedelta:
+        """Get how long to wait before polling again."""
+        interval = MAX_POLL_INTERVAL
+        for rate_id, horizon in self._horizons.items():
+            # Poll at least twice before the data runs out to have a retry
+            interval = min(interval, (horizon - now) / 2)
+            cadence = self.cadence(rate_id)
+            if cadence is not None:
+                expected = self._publications[rate_id][-1] + cadence
+                interval = min(interval, expected - now + PUBLICATION_GRACE)
+        return max(MIN_POLL_INTERVAL, min(MAX_POLL_INTERVAL, interval))
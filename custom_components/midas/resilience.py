@@ -0,0 +1,167 @@
+"""Retries and circuit breaker for requests to the MIDAS server."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import timedelta
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from california_midasapi.exception import MidasCommunicationException, MidasException
+from homeassistant.util import dt as dt_util
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+# Attempts at a request before giving up on it, the first one included
+RETRY_ATTEMPTS = 3
+# Wait before the first retry in seconds, doubled for every retry after it
+RETRY_BASE_DELAY = 1.0
+# Failed requests in a row that open the circuit
+BREAKER_THRESHOLD = 5
+# How long the circuit stays open the first time, doubled every time a trial
+#   request fails after it, up to `BREAKER_MAX_COOLDOWN`
+BREAKER_COOLDOWN = timedelta(minutes=5)
+BREAKER_MAX_COOLDOWN = timedelta(hours=1)
+
+# How the MIDAS library reports a request answered with an error status
+_STATUS_PREFIX = "Error preforming request: "
+
+DATA_CIRCUIT_BREAKER: HassKey[MidasCircuitBreaker] = HassKey(
+    f"{DOMAIN}_circuit_breaker"
+)
+
+
+class MidasCircuitOpenException(MidasCommunicationException):
+    """Exception to indicate a request wasn't made, the MIDAS server is down."""
+
+
+def async_get_circuit_breaker(hass: HomeAssistant) -> MidasCircuitBreaker:
+    """Get the circuit breaker shared by every config entry."""
+    if DATA_CIRCUIT_BREAKER not in hass.data:
+        hass.data[DATA_CIRCUIT_BREAKER] = MidasCircuitBreaker()
+    return hass.data[DATA_CIRCUIT_BREAKER]
+
+
+def request_status(exception: MidasException) -> int | None:
+    """Get the status the server answered a failed request with, if it answered."""
+    message = str(exception)
+    if not message.startswith(_STATUS_PREFIX):
+        return None
+    status = message.removeprefix(_STATUS_PREFIX).split(" ", 1)[0]
+    return int(status) if status.isdigit() else None
+
+
+def is_transient(exception: MidasException) -> bool:
+    """Return if a request that failed this way might succeed when made again."""
+    if isinstance(exception, MidasCircuitOpenException):
+        return False
+    if isinstance(exception, MidasCommunicationException):
+        return True
+    status = request_status(exception)
+    return status is not None and (
+        status >= HTTPStatus.INTERNAL_SERVER_ERROR
+        or status == HTTPStatus.TOO_MANY_REQUESTS
+    )
+
+
+def retry_delay(attempt: int) -> float:
+    """Get how long to wait before a retry, with full jitter."""
+    return random.uniform(0, RETRY_BASE_DELAY * 2 ** (attempt - 1))  # noqa: S311
+
+
+class MidasCircuitBreaker:
+    """
+    Stops requests to the MIDAS server while it is down, shared by every entry.
+
+    After `BREAKER_THRESHOLD` requests in a row failed with errors that aren't the
+    request's fault the circuit opens, and requests fail right away without
+    reaching the server. Once the cooldown passed a single trial request is let
+    through, closing the circuit if it succeeds and opening it for twice as long
+    if it doesn't.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._failures = 0
+        self._cooldown = BREAKER_COOLDOWN
+        self._open_until: datetime | None = None
+        self._trial_running = False
+        self.trips = 0
+        """Number of times the circuit opened."""
+        self.rejected = 0
+        """Number of requests failed without reaching the server."""
+
+    @property
+    def is_open(self) -> bool:
+        """Return if requests are currently being turned away."""
+        return self._open_until is not None
+
+    async def async_call[T](self, request: Callable[[], Awaitable[T]]) -> T:
+        """Make a request, retrying transient failures with exponential backoff."""
+        attempt = 1
+        while True:
+            trial = self._admit()
+            try:
+                result = await request()
+            except MidasException as exception:
+                if not is_transient(exception):
+                    # The server answered, it's up
+                    self._record_success(trial=trial)
+                    raise
+                self._record_failure(trial=trial)
+                if attempt >= RETRY_ATTEMPTS or self.is_open:
+                    raise
+                delay = retry_delay(attempt)
+                LOGGER.debug(f"Retrying MIDAS request in {delay:.1f}s: {exception}")
+                await asyncio.sleep(delay)
+                attempt += 1
+            except BaseException:
+                if trial:
+                    self._trial_running = False
+                raise
+            else:
+                self._record_success(trial=trial)
+                return result
+
+    def _admit(self) -> bool:
+        """Check a request can be made, returns if it is the trial request."""
+        if self._open_until is None:
+            return False
+        if self._trial_running or dt_util.utcnow() < self._open_until:
+            self.rejected += 1
+            msg = f"MIDAS server unavailable, not retrying until {self._open_until}"
+            raise MidasCircuitOpenException(msg)
+        self._trial_running = True
+        return True
+
+    def _record_success(self, *, trial: bool) -> None:
+        """Close the circuit after a request reached the server."""
+        if trial:
+            LOGGER.info("MIDAS server is reachable again")
+        self._failures = 0
+        self._cooldown = BREAKER_COOLDOWN
+        self._open_until = None
+        self._trial_running = False
+
+    def _record_failure(self, *, trial: bool) -> None:
+        """Count a failed request, opening the circuit if there were too many."""
+        self._failures += 1
+        if trial:
+            self._trial_running = False
+            self._cooldown = min(self._cooldown * 2, BREAKER_MAX_COOLDOWN)
+        elif self._open_until is not None or self._failures < BREAKER_THRESHOLD:
+            return
+        self.trips += 1
+        self._open_until = dt_util.utcnow() + self._cooldown
+        LOGGER.warning(
+            f"MIDAS server failed {self._failures} requests in a row, "
+            f"not making any more until {self._open_until}"
+        )
@@ -0,0 +1,164 @@
+"""Tariff boundary scheduler for MIDAS."""
+
+from __future__ import annotations
+
+import heapq
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from .tariffs import TariffIndex
+
+type BoundaryKey = tuple[str, timedelta]
+"""A rate id and the offset from now its subscribers look at tariffs."""
+
+# Time to wait before checking again when there are no tariffs to wait for
+FAILSAFE_INTERVAL = timedelta(hours=1)
+
+
+class TariffBoundaryScheduler:
+    """
+    Wakes up entities right after the tariff they show changes.
+
+    Entities subscribe with their rate id and offset. The next boundary of each
+    distinct subscription is kept in a heap and a single timer is armed for the
+    earliest one, so the number of timers does not grow with the number of entities
+    or rates. All subscriptions due at the same instant are dispatched in one batch.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        get_index: Callable[[str], TariffIndex | None],
+    ) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._get_index = get_index
+        self._listeners: dict[BoundaryKey, list[CALLBACK_TYPE]] = {}
+        self._next: dict[BoundaryKey, datetime] = {}
+        # Entries go stale when their key is rescheduled or removed, they are
+        #   skipped when popped instead of being searched for and removed
+        self._heap: list[tuple[float, BoundaryKey]] = []
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._timer_time: datetime | None = None
+
+    @property
+    def timer_count(self) -> int:
+        """Number of timers currently held with Home Assistant."""
+        return 0 if self._unsub_timer is None else 1
+
+    @property
+    def pending_boundaries(self) -> int:
+        """Number of distinct instants subscribers are waiting for."""
+        return len(set(self._next.values()))
+
+    def next_update(self, rate_id: str, offset: timedelta) -> datetime | None:
+        """Get when subscribers of the rate id and offset will be updated next."""
+        return self._next.get((rate_id, offset))
+
+    @callback
+    def async_subscribe(
+        self,
+        rate_id: str,
+        offset: timedelta,
+        update_callback: CALLBACK_TYPE,
+    ) -> CALLBACK_TYPE:
+        """Call `update_callback` every time the tariff at the offset changes."""
+        key = (rate_id, offset)
+        if key not in self._listeners:
+            self._listeners[key] = []
+            self._schedule(key, dt_util.utcnow())
+            self._async_arm()
+        self._listeners[key].append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the subscription."""
+            self._listeners[key].remove(update_callback)
+            if len(self._listeners[key]) == 0:
+                del self._listeners[key]
+                del self._next[key]
+                self._async_arm()
+
+        return remove_listener
+
+    @callback
+    def async_reschedule(self) -> None:
+        """Recalculate every boundary, call after the tariff data changed."""
+        now = dt_util.utcnow()
+        self._heap.clear()
+        for key in self._listeners:
+            self._schedule(key, now)
+        self._async_arm()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the timer."""
+        self._listeners.clear()
+        self._next.clear()
+        self._heap.clear()
+        self._async_arm()
+
+    def _schedule(self, key: BoundaryKey, now: datetime) -> None:
+        """Calculate the next boundary for the key and queue it."""
+        rate_id, offset = key
+        index = self._get_index(rate_id)
+        boundary = None if index is None else index.next_boundary(now + offset)
+        if boundary is None:
+            next_update = now + FAILSAFE_INTERVAL
+        else:
+            # add 1 second to get to the first second of the next tariff
+            # we want the 15 minute sensor to update 15 minutes before the end of the
+            #   tariff so subtract the offset
+            next_update = boundary + timedelta(seconds=1) - offset
+        self._next[key] = next_update
+        heapq.heappush(self._heap, (next_update.timestamp(), key))
+
+    def _is_current(self, entry: tuple[float, BoundaryKey]) -> bool:
+        """Return if a heap entry is still the next boundary of its key."""
+        timestamp, key = entry
+        next_update = self._next.get(key)
+        return next_update is not None and next_update.timestamp() == timestamp
+
+    @callback
+    def _async_arm(self) -> None:
+        """Make sure the timer is set for the earliest queued boundary."""
+        while len(self._heap) > 0 and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        next_time = None if len(self._heap) == 0 else self._next[self._heap[0][1]]
+        if next_time == self._timer_time:
+            return
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._timer_time = next_time
+        if next_time is not None:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self._hass, self._async_fire, next_time
+            )
+
+    @callback
+    def _async_fire(self, now: datetime) -> None:
+        """Dispatch every subscription whose boundary has passed."""
+        self._unsub_timer = None
+        self._timer_time = None
+        timestamp = now.timestamp()
+        due: list[BoundaryKey] = []
+        while len(self._heap) > 0 and self._heap[0][0] <= timestamp:
+            entry = heapq.heappop(self._heap)
+            if self._is_current(entry):
+                due.append(entry[1])
+        # Schedule first so the subscribers see their next update time
+        for key in due:
+            self._schedule(key, now)
+        self._async_arm()
+        for key in due:
+            for update_callback in list(self._listeners.get(key, ())):
+                update_callback()
@@ -7,24 +7,27 @@ from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
-from homeassistant.components.sensor.const import SensorDeviceClass
-from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
-from homeassistant.helpers.event import async_track_point_in_time
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.components.sensor.const import SensorDeviceClass, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
 
-from .const import ATTRIBUTION, DOMAIN
-from .coordinator import MidasDataUpdateCoordinator
+from .const import LOGGER
+from .entity import MidasEntity
+from .metrics import REFRESH_AUTH_FAILED, REFRESH_FAILED
 
 if TYPE_CHECKING:
     from collections.abc import Callable
     from decimal import Decimal
 
     from california_midasapi.types import RateInfo, ValueInfoItem
-    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+    from homeassistant.core import HomeAssistant
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
     from homeassistant.helpers.typing import StateType
 
+    from .coordinator import MidasDataUpdateCoordinator
     from .data import IntegrationMidasConfigEntry
+    from .tariffs import ScheduleEntry
 
 DATA_RATE_NAME = "rate_name"
 DATA_RATE_TYPE = "rate_type"
@@ -33,16 +36,24 @@ DATA_TARIFF_NAME = "tariff_name"
 DATA_START_TIME = "start_time"
 DATA_END_TIME = "end_time"
 DATA_UPDATE_LOOP_NEXT_TIME = "update_loop_next_time"
+DATA_FETCHED_AT = "data_fetched_at"
+DATA_SCHEDULE = "schedule"
+DATA_REQUESTS = "requests"
+DATA_MEAN = "mean"
+DATA_BUCKETS = "buckets"
+
+REFRESH_OUTCOME_SUCCESS = "success"
+REFRESH_OUTCOME_FAILED = "failed"
 
 
 @dataclass(frozen=True, kw_only=True)
 class MidasSensorEntityDescription(SensorEntityDescription):
     """Describes MIDAS sensors."""
 
-    offset_fn: Callable[[RateInfo], timedelta] = lambda _: timedelta()
-    """Function to get the offset from the current time this sensor applies to.
+    offset: timedelta = timedelta()
+    """Offset from the current time this sensor applies to.
 
-    Used in `rate.GetActiveTariffs()` to get the tariff to pass into `value_fn`."""
+    Used to look up the active tariff to pass into `value_fn`."""
 
     value_fn: Callable[
         [RateInfo, ValueInfoItem], StateType | date | datetime | Decimal
@@ -55,115 +66,188 @@ class MidasSensorEntityDescription(SensorEntityDescription):
         return f"{rate_id}_{self.key}"
 
 
-# Each of these sensors is created for every configured rate id
-SENSOR_DESCRIPTIONS: tuple[MidasSensorEntityDescription, ...] = (
-    MidasSensorEntityDescription(
-        key="current",
-        translation_key="current",
-        icon="mdi:meter-electric",
-        native_unit_of_measurement="USD/kWh",
-        suggested_display_precision=5,
-    ),
-    MidasSensorEntityDescription(
-        key="current_tariff_name",
-        translation_key="current_tariff_name",
-        icon="mdi:text",
-        entity_registry_enabled_default=False,
-        value_fn=lambda _, tariff: tariff.ValueName,
-    ),
-    MidasSensorEntityDescription(
-        key="current_tariff_start",
-        translation_key="current_tariff_start",
-        icon="mdi:clock-start",
-        device_class=SensorDeviceClass.TIMESTAMP,
-        entity_registry_enabled_default=False,
-        value_fn=lambda _, tariff: tariff.GetStart(),
-    ),
-    MidasSensorEntityDescription(
-        key="current_tariff_end",
-        translation_key="current_tariff_end",
-        icon="mdi:clock-end",
-        device_class=SensorDeviceClass.TIMESTAMP,
-        entity_registry_enabled_default=False,
-        value_fn=lambda _, tariff: tariff.GetEnd(),
-    ),
-    MidasSensorEntityDescription(
-        key="15min",
-        translation_key="15min",
-        icon="mdi:meter-electric",
-        native_unit_of_measurement="USD/kWh",
-        suggested_display_precision=5,
-        offset_fn=lambda _: timedelta(minutes=15),
-    ),
-    MidasSensorEntityDescription(
-        key="15min_tariff_name",
-        translation_key="15min_tariff_name",
-        icon="mdi:text",
-        entity_registry_enabled_default=False,
-        offset_fn=lambda _: timedelta(minutes=15),
-        value_fn=lambda _, tariff: tariff.ValueName,
-    ),
-    MidasSensorEntityDescription(
-        key="15min_tariff_start",
-        translation_key="15min_tariff_start",
-        icon="mdi:clock-start",
-        device_class=SensorDeviceClass.TIMESTAMP,
-        entity_registry_enabled_default=False,
-        offset_fn=lambda _: timedelta(minutes=15),
-        value_fn=lambda _, tariff: tariff.GetStart(),
-    ),
-    MidasSensorEntityDescription(
-        key="15min_tariff_end",
-        translation_key="15min_tariff_end",
-        icon="mdi:clock-end",
-        device_class=SensorDeviceClass.TIMESTAMP,
-        entity_registry_enabled_default=False,
-        offset_fn=lambda _: timedelta(minutes=15),
-        value_fn=lambda _, tariff: tariff.GetEnd(),
-    ),
-    MidasSensorEntityDescription(
-        key="1hour",
-        translation_key="1hour",
-        icon="mdi:meter-electric",
-        native_unit_of_measurement="USD/kWh",
-        suggested_display_precision=5,
-        offset_fn=lambda _: timedelta(hours=1),
-    ),
-    MidasSensorEntityDescription(
-        key="1hour_tariff_name",
-        translation_key="1hour_tariff_name",
-        icon="mdi:text",
-        entity_registry_enabled_default=False,
-        offset_fn=lambda _: timedelta(hours=1),
-        value_fn=lambda _, tariff: tariff.ValueName,
-    ),
-    MidasSensorEntityDescription(
-        key="1hour_tariff_start",
-        translation_key="1hour_tariff_start",
-        icon="mdi:clock-start",
-        device_class=SensorDeviceClass.TIMESTAMP,
+def offset_key(minutes: int) -> str:
+    """Get the key prefix of the sensors for an offset, like `15min` or `1hour`."""
+    if minutes == 0:
+        return "current"
+    if minutes % 60 == 0:
+        return f"{minutes // 60}hour"
+    return f"{minutes}min"
+
+
+def offset_label(minutes: int) -> str:
+    """Get the name of an offset shown in the sensor names, like `15 minutes`."""
+    if minutes % 60 == 0:
+        hours = minutes // 60
+        return f"{hours} hour" if hours == 1 else f"{hours} hours"
+    return f"{minutes} minute" if minutes == 1 else f"{minutes} minutes"
+
+
+def sensor_descriptions(
+    offsets: list[int],
+) -> tuple[MidasSensorEntityDescription, ...]:
+    """
+    Get the descriptions of the sensors created for every configured rate id.
+
+    There is a price, tariff name, tariff start and tariff end sensor for the
+    current time and for each lookahead offset, given in minutes.
+    """
+    descriptions: list[MidasSensorEntityDescription] = []
+    for minutes in sorted({0, *offsets}):
+        key = offset_key(minutes)
+        if minutes == 0:
+            translation_key = "current"
+            placeholders = None
+        else:
+            translation_key = "future"
+            placeholders = {"offset": offset_label(minutes)}
+        offset = timedelta(minutes=minutes)
+        descriptions.extend(
+            (
+                MidasSensorEntityDescription(
+                    key=key,
+                    translation_key=translation_key,
+                    translation_placeholders=placeholders,
+                    icon="mdi:meter-electric",
+                    native_unit_of_measurement="USD/kWh",
+                    suggested_display_precision=5,
+                    offset=offset,
+                ),
+                MidasSensorEntityDescription(
+                    key=f"{key}_tariff_name",
+                    translation_key=f"{translation_key}_tariff_name",
+                    translation_placeholders=placeholders,
+                    icon="mdi:text",
+                    entity_registry_enabled_default=False,
+                    offset=offset,
+                    value_fn=lambda _, tariff: tariff.ValueName,
+                ),
+                MidasSensorEntityDescription(
+                    key=f"{key}_tariff_start",
+                    translation_key=f"{translation_key}_tariff_start",
+                    translation_placeholders=placeholders,
+                    icon="mdi:clock-start",
+                    device_class=SensorDeviceClass.TIMESTAMP,
+                    entity_registry_enabled_default=False,
+                    offset=offset,
+                    value_fn=lambda _, tariff: tariff.GetStart(),
+                ),
+                MidasSensorEntityDescription(
+                    key=f"{key}_tariff_end",
+                    translation_key=f"{translation_key}_tariff_end",
+                    translation_placeholders=placeholders,
+                    icon="mdi:clock-end",
+                    device_class=SensorDeviceClass.TIMESTAMP,
+                    entity_registry_enabled_default=False,
+                    offset=offset,
+                    value_fn=lambda _, tariff: tariff.GetEnd(),
+                ),
+            )
+        )
+    return tuple(descriptions)
+
+
+# Created for every configured rate id, shows the upcoming tariffs all at once
+FORECAST_DESCRIPTION = MidasSensorEntityDescription(
+    key="forecast",
+    translation_key="forecast",
+    icon="mdi:chart-timeline-variant",
+    device_class=SensorDeviceClass.TIMESTAMP,
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class MidasDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes MIDAS diagnostic sensors."""
+
+    value_fn: Callable[[MidasDataUpdateCoordinator, str], StateType]
+    """Function to get the value of the sensor.
+    Receives the coordinator and the rate id."""
+
+    attributes_fn: Callable[
+        [MidasDataUpdateCoordinator, str], dict[str, Any] | None
+    ] = lambda *_: None
+
+    def unique_id_fn(self, rate_id: str) -> str:
+        """Return a unique id for the entity."""
+        return f"{rate_id}_{self.key}"
+
+
+def _fetch_latency(coordinator: MidasDataUpdateCoordinator, rate_id: str) -> StateType:
+    """Get how long the last request for a rate's data took, in milliseconds."""
+    histogram = coordinator.metrics.fetch_latency.get(rate_id)
+    if histogram is None or histogram.last is None:
+        return None
+    return histogram.last * 1000
+
+
+def _fetch_latency_attributes(
+    coordinator: MidasDataUpdateCoordinator, rate_id: str
+) -> dict[str, Any] | None:
+    """Get the request count, average and histogram of a rate's requests."""
+    histogram = coordinator.metrics.fetch_latency.get(rate_id)
+    if histogram is None:
+        return None
+    data = histogram.as_dict()
+    return {
+        DATA_REQUESTS: data["count"],
+        DATA_MEAN: None if data["mean"] is None else data["mean"] * 1000,
+        DATA_BUCKETS: data["buckets"],
+    }
+
+
+def _refresh_outcome(
+    coordinator: MidasDataUpdateCoordinator, rate_id: str
+) -> StateType:
+    """Get if the last refresh got new data for a rate."""
+    outcome = coordinator.metrics.last_refresh_outcome
+    if outcome is None:
+        return None
+    if (
+        outcome in (REFRESH_FAILED, REFRESH_AUTH_FAILED)
+        or rate_id in coordinator.failed_rate_ids
+        or rate_id in coordinator.stale_rate_ids
+    ):
+        return REFRESH_OUTCOME_FAILED
+    return REFRESH_OUTCOME_SUCCESS
+
+
+# Created for every configured rate id, disabled unless looking into a problem
+DIAGNOSTIC_DESCRIPTIONS = (
+    MidasDiagnosticSensorEntityDescription(
+        key="fetch_latency",
+        translation_key="fetch_latency",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
-        offset_fn=lambda _: timedelta(hours=1),
-        value_fn=lambda _, tariff: tariff.GetStart(),
+        value_fn=_fetch_latency,
+        attributes_fn=_fetch_latency_attributes,
     ),
-    MidasSensorEntityDescription(
-        key="1hour_tariff_end",
-        translation_key="1hour_tariff_end",
-        icon="mdi:clock-end",
-        device_class=SensorDeviceClass.TIMESTAMP,
+    MidasDiagnosticSensorEntityDescription(
+        key="refresh_outcome",
+        translation_key="refresh_outcome",
+        icon="mdi:cloud-sync",
+        device_class=SensorDeviceClass.ENUM,
+        options=[REFRESH_OUTCOME_SUCCESS, REFRESH_OUTCOME_FAILED],
+        entity_category=EntityCategory.DIAGNOSTIC,
         entity_registry_enabled_default=False,
-        offset_fn=lambda _: timedelta(hours=1),
-        value_fn=lambda _, tariff: tariff.GetEnd(),
+        value_fn=_refresh_outcome,
     ),
 )
 
 
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001 Unused function argument: `hass`
+    hass: HomeAssistant,
     entry: IntegrationMidasConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the sensor platform."""
+    descriptions = sensor_descriptions(entry.runtime_data.offsets)
+    _remove_stale_entities(hass, entry, descriptions)
     async_add_entities(
         [
             MidasPriceSensor(
@@ -171,20 +255,74 @@ async def async_setup_entry(
                 description=description,
                 rate_id=rate_id,
             )  # Create a sensor
-            for description in SENSOR_DESCRIPTIONS  # For each time offset
+            for description in descriptions  # For each time offset
             for rate_id in entry.runtime_data.rate_ids  # For each configured rate id
         ]
     )
+    async_add_entities(
+        [
+            MidasForecastSensor(
+                coordinator=entry.runtime_data.coordinator,
+                description=FORECAST_DESCRIPTION,
+                rate_id=rate_id,
+            )
+            for rate_id in entry.runtime_data.rate_ids
+        ]
+    )
+    async_add_entities(
+        [
+            MidasDiagnosticSensor(
+                coordinator=entry.runtime_data.coordinator,
+                description=description,
+                rate_id=rate_id,
+            )
+            for description in DIAGNOSTIC_DESCRIPTIONS
+            for rate_id in entry.runtime_data.rate_ids
+        ]
+    )
 
 
-class MidasPriceSensor(CoordinatorEntity[MidasDataUpdateCoordinator], SensorEntity):
+def _remove_stale_entities(
+    hass: HomeAssistant,
+    entry: IntegrationMidasConfigEntry,
+    descriptions: tuple[MidasSensorEntityDescription, ...],
+) -> None:
+    """Remove the sensors of offsets or rate ids that are no longer configured."""
+    expected = {
+        description.unique_id_fn(rate_id)
+        for description in (
+            *descriptions,
+            FORECAST_DESCRIPTION,
+            *DIAGNOSTIC_DESCRIPTIONS,
+        )
+        for rate_id in entry.runtime_data.rate_ids
+    }
+    entity_registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id):
+        if entity.domain == "sensor" and entity.unique_id not in expected:
+            LOGGER.debug(f"Removing sensor {entity.entity_id}, no longer configured")
+            entity_registry.async_remove(entity.entity_id)
+
+
+class MidasPriceSensor(MidasEntity, SensorEntity):
     """MIDAS Price Sensor class."""
 
-    _attr_has_entity_name = True
-    _attr_attribution = ATTRIBUTION
+    # Rate details only change with the rate plan and the rest is housekeeping,
+    #   recording them would repeat them in the database on every tariff changeover
+    _unrecorded_attributes = frozenset(
+        {
+            DATA_RATE_NAME,
+            DATA_RATE_TYPE,
+            DATA_RATE_URL,
+            DATA_UPDATE_LOOP_NEXT_TIME,
+            DATA_FETCHED_AT,
+        }
+    )
 
-    _update_loop_callback_removal_callback: CALLBACK_TYPE
-    _update_loop_next_time: datetime | None = None
+    # Tariff resolved for the next state write, see `_resolve_tariff`
+    _rate: RateInfo
+    _tariff: ValueInfoItem | None = None
+    _resolved_rate_available: bool = False
 
     entity_description: MidasSensorEntityDescription
 
@@ -195,85 +333,215 @@ class MidasPriceSensor(CoordinatorEntity[MidasDataUpdateCoordinator], SensorEnti
         rate_id: str,
     ) -> None:
         """Initialize the sensor class."""
-        super().__init__(coordinator=coordinator)
+        super().__init__(coordinator=coordinator, rate_id=rate_id)
 
         self.entity_description = description
-        self._rate_id = rate_id
+        self._offset = description.offset
         self._attr_unique_id = description.unique_id_fn(self._rate_id)
 
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, self._rate_id)},
-            name=self._rate_id,
-            manufacturer=None,
-            model=None,
-            entry_type=DeviceEntryType.SERVICE,
-        )
-
     async def async_added_to_hass(self) -> None:
-        """Callback for initial sensor creation, starts internal update loop."""  # noqa: D401
+        """Callback for initial sensor creation, subscribes to tariff changeovers."""  # noqa: D401
         await super().async_added_to_hass()
-        # Start our own internal update loop so we update right on the tariff changeover
-        await self._async_update_loop(datetime.now())  # noqa: DTZ005
-        # Cancel the update loop on the destruction of this sensor
-        self.async_on_remove(self._update_loop_callback_removal_callback)
-
-    async def _async_update_loop(self, now: datetime) -> None:
-        """Update the current sensor and schedules this function to run again at the beginning of the next tariff."""  # noqa: E501
-        # Update this sensor
+        self._resolve_tariff()
+        # Update right on the tariff changeover, cancelled on the destruction of
+        #   this sensor
+        self.async_on_remove(
+            self.coordinator.scheduler.async_subscribe(
+                self._rate_id, self._offset, self._handle_tariff_change
+            )
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Resolve the tariff against the new data before writing the state."""
+        if (
+            self._rate_id not in self.coordinator.changed_rate_ids
+            and self._rate_available() == self._resolved_rate_available
+        ):
+            # Another rate changed, nothing this sensor shows did
+            return
+        self._resolve_tariff()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _handle_tariff_change(self) -> None:
+        """Update the sensor right after the tariff it shows changed."""
+        self._resolve_tariff()
         self.async_write_ha_state()
 
-        # Schedule the next update right after the end of the current tariff
-        rate = self.coordinator.data[self._rate_id]
-        offset = self.entity_description.offset_fn(rate)
-        tariffs = rate.GetActiveTariffs(datetime.now() + offset)  # noqa: DTZ005
-
-        next_update = now + timedelta(hours=1)  # failsafe hourly update for no tariffs
-        if len(tariffs) > 0:
-            # add 1 second to get to the first second of the next tariff
-            # we want the 15 minute sensor to update 15 minutes before the end of the
-            #   tariff so subtract the offset
-            # the hour sensor will already be on the end of the next tariff so
-            #   subtracting an hour from it will still be an hour from now
-            next_update = (tariffs[0].GetEnd() + timedelta(seconds=1)) - offset
-        self._update_loop_callback_removal_callback = async_track_point_in_time(
-            self.hass, self._async_update_loop, next_update
-        )
-        self._update_loop_next_time = next_update
-        self.async_write_ha_state()  # Update again to get next loop attribute updated
+    @callback
+    def _resolve_tariff(self) -> None:
+        """
+        Look up the tariff this sensor currently shows.
+
+        Done once before each state write so the state, attributes and availability
+        are all computed from the same tariff at the same instant.
+        """
+        self._resolved_rate_available = self._rate_available()
+        rate = self.coordinator.data.get(self._rate_id)
+        if rate is None:
+            # Rate failed to update and there is no earlier data to fall back on
+            self._tariff = None
+            return
+        self._rate = rate
+        # Shared by every sensor of the rate with the same offset
+        # No tariffs is possible! Logging for this event is handled by the coordinator.
+        self._tariff = self.coordinator.active_tariff(self._rate_id, self._offset)
 
     @property
     def native_value(self) -> StateType | date | datetime | Decimal:
         """Return the native value of the sensor."""
-        rate = self.coordinator.data[self._rate_id]
-        offset = self.entity_description.offset_fn(rate)
-        tariffs = rate.GetActiveTariffs(datetime.now() + offset)  # noqa: DTZ005
-        if len(tariffs) == 0:
-            # No tariffs! Logging for this event is handled by the coordinator.
+        if self._tariff is None:
             return None
-        tariff = tariffs[0]
-        return self.entity_description.value_fn(rate, tariff)
+        return self.entity_description.value_fn(self._rate, self._tariff)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any] | None:
         """Extra data for the sensor."""
-        rate = self.coordinator.data[self._rate_id]
-        offset = self.entity_description.offset_fn(rate)
-        tariffs = rate.GetActiveTariffs(datetime.now() + offset)  # noqa: DTZ005
-        if len(tariffs) == 0:
-            # No tariffs! Logging for this event is handled by the coordinator.
+        if self._tariff is None:
+            return None
+        return {
+            DATA_RATE_NAME: self._rate.RateName,
+            DATA_RATE_TYPE: self._rate.RateType,
+            DATA_RATE_URL: self._rate.RatePlan_Url,
+            DATA_TARIFF_NAME: self._tariff.ValueName,
+            DATA_START_TIME: self._tariff.GetStart(),
+            DATA_END_TIME: self._tariff.GetEnd(),
+            DATA_UPDATE_LOOP_NEXT_TIME: self.coordinator.scheduler.next_update(
+                self._rate_id, self._offset
+            ),
+            DATA_FETCHED_AT: self.coordinator.fetched_at.get(self._rate_id),
+        }
+
+    @property
+    def available(self) -> bool:
+        """Returns if the sensor is available."""
+        return self._rate_available() and self._tariff is not None
+
+
+class MidasForecastSensor(MidasEntity, SensorEntity):
+    """
+    MIDAS Forecast Sensor class.
+
+    Lists the upcoming tariffs of a rate in its attributes so they can be read from
+    a single entity. The schedule is built by the coordinator once per refresh and
+    the state is only written when it changes, not on every tariff changeover. The
+    state is when the last tariff in the schedule ends.
+    """
+
+    # The schedule is too large to be worth keeping a history of, and when it was
+    #   fetched is housekeeping
+    _unrecorded_attributes = frozenset({DATA_SCHEDULE, DATA_FETCHED_AT})
+
+    # Schedule shown by the last state write
+    _schedule: tuple[ScheduleEntry, ...] = ()
+    _resolved_rate_available: bool = False
+
+    entity_description: MidasSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: MidasDataUpdateCoordinator,
+        description: MidasSensorEntityDescription,
+        rate_id: str,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator=coordinator, rate_id=rate_id)
+
+        self.entity_description = description
+        self._attr_unique_id = description.unique_id_fn(self._rate_id)
+
+    async def async_added_to_hass(self) -> None:
+        """Callback for initial sensor creation."""  # noqa: D401
+        await super().async_added_to_hass()
+        self._resolve_schedule()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if the schedule or availability changed."""
+        if (
+            self.coordinator.schedules.get(self._rate_id) is self._schedule
+            and self._rate_available() == self._resolved_rate_available
+        ):
+            return
+        self._resolve_schedule()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _resolve_schedule(self) -> None:
+        """Take the schedule of this sensor's rate for the next state write."""
+        self._resolved_rate_available = self._rate_available()
+        self._schedule = self.coordinator.schedules.get(self._rate_id, ())
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the end of the last tariff in the schedule."""
+        if len(self._schedule) == 0:
             return None
-        tariff = tariffs[0]
+        return self._schedule[-1][1]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Extra data for the sensor."""
         return {
-            DATA_RATE_NAME: rate.RateName,
-            DATA_RATE_TYPE: rate.RateType,
-            DATA_RATE_URL: rate.RatePlan_Url,
-            DATA_TARIFF_NAME: tariff.ValueName,
-            DATA_START_TIME: tariff.GetStart(),
-            DATA_END_TIME: tariff.GetEnd(),
-            DATA_UPDATE_LOOP_NEXT_TIME: self._update_loop_next_time,
+            DATA_SCHEDULE: self._schedule,
+            DATA_FETCHED_AT: self.coordinator.fetched_at.get(self._rate_id),
         }
 
     @property
     def available(self) -> bool:
         """Returns if the sensor is available."""
-        return super().available and (self.native_value is not None)
+        return self._rate_available() and len(self._schedule) > 0
+
+
+class MidasDiagnosticSensor(MidasEntity, SensorEntity):
+    """
+    MIDAS Diagnostic Sensor class.
+
+    Shows the coordinator's metrics for a rate. Written after every refresh, even
+    the ones that got the same data, and available even when the refresh failed so
+    the failure can be seen.
+    """
+
+    # The histogram only grows, its history isn't worth keeping
+    _unrecorded_attributes = frozenset({DATA_BUCKETS})
+
+    entity_description: MidasDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: MidasDataUpdateCoordinator,
+        description: MidasDiagnosticSensorEntityDescription,
+        rate_id: str,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator=coordinator, rate_id=rate_id)
+
+        self.entity_description = description
+        self._attr_unique_id = description.unique_id_fn(self._rate_id)
+
+    async def async_added_to_hass(self) -> None:
+        """Callback for initial sensor creation, subscribes to refreshes."""  # noqa: D401
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.metrics.async_subscribe(self.async_write_ha_state)
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Do nothing, the state is written after every refresh instead."""
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the native value of the sensor."""
+        return self.entity_description.value_fn(self.coordinator, self._rate_id)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Extra data for the sensor."""
+        return self.entity_description.attributes_fn(self.coordinator, self._rate_id)
+
+    @property
+    def available(self) -> bool:
+        """Returns if the sensor is available."""
+        return True
@@ -0,0 +1,259 @@
+"""Services for the MIDAS integration."""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .history import async_get_history_importer
+from .planner import DeferrableLoad, LoadPlanner, slot_prices
+from .tariffs import cheapest_window
+
+if TYPE_CHECKING:
+    from .coordinator import MidasDataUpdateCoordinator
+    from .data import IntegrationMidasConfigEntry
+
+SERVICE_FIND_CHEAPEST_WINDOW = "find_cheapest_window"
+SERVICE_PLAN_LOADS = "plan_loads"
+SERVICE_IMPORT_HISTORY = "import_history"
+
+ATTR_RATE_ID = "rate_id"
+ATTR_DURATION = "duration"
+ATTR_HORIZON = "horizon"
+ATTR_LOADS = "loads"
+ATTR_NAME = "name"
+ATTR_ENERGY = "energy"
+ATTR_POWER = "power"
+ATTR_DEADLINE = "deadline"
+ATTR_POWER_LIMIT = "power_limit"
+ATTR_START = "start"
+
+DEFAULT_HORIZON = timedelta(hours=24)
+DEFAULT_PLAN_HORIZON = timedelta(hours=48)
+# Resolution loads are planned at
+PLAN_SLOT = timedelta(minutes=5)
+
+FIND_CHEAPEST_WINDOW_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_RATE_ID): cv.string,
+        vol.Required(ATTR_DURATION): vol.All(
+            cv.time_period, cv.positive_timedelta, vol.Range(min=timedelta(minutes=1))
+        ),
+        vol.Optional(ATTR_HORIZON, default=DEFAULT_HORIZON): vol.All(
+            cv.time_period, cv.positive_timedelta
+        ),
+    }
+)
+
+PLAN_LOADS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_RATE_ID): cv.string,
+        vol.Required(ATTR_LOADS): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required(ATTR_NAME): cv.string,
+                        vol.Required(ATTR_ENERGY): cv.positive_float,
+                        vol.Required(ATTR_POWER): cv.positive_float,
+                        vol.Optional(ATTR_DURATION): vol.All(
+                            cv.time_period, cv.positive_timedelta
+                        ),
+                        vol.Optional(ATTR_DEADLINE): cv.datetime,
+                    }
+                )
+            ],
+            vol.Length(min=1),
+        ),
+        vol.Optional(ATTR_POWER_LIMIT): cv.positive_float,
+        vol.Optional(ATTR_HORIZON, default=DEFAULT_PLAN_HORIZON): vol.All(
+            cv.time_period, cv.positive_timedelta
+        ),
+    }
+)
+
+IMPORT_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_RATE_ID): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the MIDAS services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_FIND_CHEAPEST_WINDOW,
+        _async_find_cheapest_window,
+        schema=FIND_CHEAPEST_WINDOW_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PLAN_LOADS,
+        _async_plan_loads,
+        schema=PLAN_LOADS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_IMPORT_HISTORY,
+        _async_import_history,
+        schema=IMPORT_HISTORY_SCHEMA,
+    )
+
+
+def _get_entry(hass: HomeAssistant, rate_id: str) -> IntegrationMidasConfigEntry:
+    """Get a loaded entry with data for the rate id."""
+    entries: list[IntegrationMidasConfigEntry]
+    entries = hass.config_entries.async_loaded_entries(DOMAIN)
+    for entry in entries:
+        if rate_id in entry.runtime_data.coordinator.tariff_indexes:
+            return entry
+    raise ServiceValidationError(
+        translation_domain=DOMAIN,
+        translation_key="rate_id_not_loaded",
+        translation_placeholders={"rid": rate_id},
+    )
+
+
+def _get_coordinator(hass: HomeAssistant, rate_id: str) -> MidasDataUpdateCoordinator:
+    """Get the coordinator of a loaded entry with data for the rate id."""
+    return _get_entry(hass, rate_id).runtime_data.coordinator
+
+
+async def _async_find_cheapest_window(call: ServiceCall) -> ServiceResponse:
+    """Find the cheapest time to run a load of the given duration."""
+    rate_id: str = call.data[ATTR_RATE_ID]
+    duration: timedelta = call.data[ATTR_DURATION]
+    horizon: timedelta = call.data[ATTR_HORIZON]
+    coordinator = _get_coordinator(call.hass, rate_id)
+
+    now = dt_util.utcnow()
+    segments = coordinator.tariff_indexes[rate_id].price_segments(now, now + horizon)
+    found = cheapest_window(
+        segments,
+        now.timestamp(),
+        (now + horizon).timestamp(),
+        duration.total_seconds(),
+    )
+    if found is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="no_window",
+            translation_placeholders={"rid": rate_id},
+        )
+
+    start = dt_util.utc_from_timestamp(found[0])
+    return {
+        "start": start.isoformat(),
+        "end": (start + duration).isoformat(),
+        "average_price": found[1],
+    }
+
+
+async def _async_plan_loads(call: ServiceCall) -> ServiceResponse:
+    """Plan when to run several loads for the lowest total cost."""
+    rate_id: str = call.data[ATTR_RATE_ID]
+    horizon: timedelta = call.data[ATTR_HORIZON]
+    coordinator = _get_coordinator(call.hass, rate_id)
+
+    now = dt_util.utcnow()
+    slot_count = math.ceil(horizon / PLAN_SLOT)
+    slot_hours = PLAN_SLOT / timedelta(hours=1)
+    segments = coordinator.tariff_indexes[rate_id].price_segments(
+        now, now + slot_count * PLAN_SLOT
+    )
+    prices = slot_prices(
+        segments, now.timestamp(), PLAN_SLOT.total_seconds(), slot_count
+    )
+    loads = [
+        _make_load(load, now, slot_hours, slot_count) for load in call.data[ATTR_LOADS]
+    ]
+    if len({load.name for load in loads}) != len(loads):
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="duplicate_load_names"
+        )
+
+    planner = LoadPlanner(prices, slot_hours, call.data.get(ATTR_POWER_LIMIT))
+    starts = planner.plan(loads)
+
+    schedule = []
+    for load in loads:
+        if load.name not in starts:
+            continue
+        start = starts[load.name]
+        schedule.append(
+            {
+                ATTR_NAME: load.name,
+                "start": (now + start * PLAN_SLOT).isoformat(),
+                "end": (now + (start + load.slots) * PLAN_SLOT).isoformat(),
+                ATTR_POWER: load.power,
+                "cost": planner.cost(load, start),
+            }
+        )
+    schedule.sort(key=lambda planned: planned["start"])
+    return {
+        "schedule": schedule,
+        "unscheduled": [load.name for load in loads if load.name not in starts],
+        "total_cost": sum(planned["cost"] for planned in schedule),
+    }
+
+
+async def _async_import_history(call: ServiceCall) -> None:
+    """Start importing the price history of a rate into long-term statistics."""
+    rate_id: str = call.data[ATTR_RATE_ID]
+    entry = _get_entry(call.hass, rate_id)
+    # Without a time zone the start is in the local time of Home Assistant
+    start: datetime | None = call.data.get(ATTR_START)
+    # Years of history take a while, don't hold up the caller
+    async_get_history_importer(call.hass).async_start(
+        entry.runtime_data.client, rate_id, start
+    )
+
+
+def _make_load(
+    load: dict, now: datetime, slot_hours: float, slot_count: int
+) -> DeferrableLoad:
+    """Fit a load from a service call onto the planning grid."""
+    energy: float = load[ATTR_ENERGY]
+    power_cap: float = load[ATTR_POWER]
+    duration: timedelta | None = load.get(ATTR_DURATION)
+    if duration is None:
+        # Run flat out
+        slots = math.ceil(energy / power_cap / slot_hours - 1e-9)
+    else:
+        slots = math.ceil(duration / PLAN_SLOT)
+    # Spread the energy evenly over the slots it runs in
+    power = energy / (slots * slot_hours)
+    if power > power_cap + 1e-9:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="load_over_power",
+            translation_placeholders={"name": load[ATTR_NAME]},
+        )
+
+    deadline = slot_count
+    if ATTR_DEADLINE in load:
+        # Without a time zone the deadline is in the local time of Home Assistant
+        until = dt_util.as_utc(load[ATTR_DEADLINE])
+        deadline = min(slot_count, math.floor((until - now) / PLAN_SLOT))
+    return DeferrableLoad(
+        name=load[ATTR_NAME], power=power, slots=slots, deadline=deadline
+    )
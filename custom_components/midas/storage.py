@@ -0,0 +1,70 @@
+"""Persistent storage of MIDAS rates."""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from typing import TYPE_CHECKING, Any, TypedDict
+
+from california_midasapi.types import RateInfo, ValueInfoItem
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from homeassistant.core import HomeAssistant
+
+STORAGE_VERSION = 1
+# Wait a bit before writing so refreshes close together only write once
+STORAGE_SAVE_DELAY = 10
+
+# Tariffs are stored as rows of these fields instead of objects to save space
+_TARIFF_FIELDS = tuple(field.name for field in fields(ValueInfoItem))
+_RATE_FIELDS = tuple(
+    field.name for field in fields(RateInfo) if field.name != "ValueInformation"
+)
+
+
+class StoredRate(TypedDict):
+    """A rate as saved to disk."""
+
+    fetched_at: str
+    rate: dict[str, Any]
+    tariffs: list[list[Any]]
+
+
+class StoredRates(TypedDict):
+    """Everything saved to disk for a config entry."""
+
+    rates: dict[str, StoredRate]
+
+
+def rate_store(hass: HomeAssistant, entry_id: str) -> Store[StoredRates]:
+    """Get the store holding the last fetched rates of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.rates")
+
+
+def rate_to_store(rate: RateInfo, fetched_at: datetime) -> StoredRate:
+    """Convert a rate to its stored form."""
+    return {
+        "fetched_at": fetched_at.isoformat(),
+        "rate": {name: getattr(rate, name) for name in _RATE_FIELDS},
+        "tariffs": [
+            [getattr(tariff, name) for name in _TARIFF_FIELDS]
+            for tariff in rate.ValueInformation
+        ],
+    }
+
+
+def rate_from_store(stored: StoredRate) -> tuple[RateInfo, datetime | None]:
+    """Convert a stored rate back, along with when it was fetched."""
+    rate = RateInfo(
+        **stored["rate"],
+        ValueInformation=[
+            ValueInfoItem(**dict(zip(_TARIFF_FIELDS, row, strict=True)))
+            for row in stored["tariffs"]
+        ],
+    )
+    return rate, dt_util.parse_datetime(stored["fetched_at"])
@@ -0,0 +1,267 @@
+"""Tariff lookup index for MIDAS rates."""
+
+from __future__ import annotations
+
+import hashlib
+from bisect import bisect_left, bisect_right
+from datetime import UTC, datetime
+from heapq import merge
+from itertools import pairwise
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from california_midasapi.types import RateInfo, ValueInfoItem
+
+type ScheduleEntry = tuple[datetime, datetime, float, str]
+"""A tariff in a schedule, its start, end, price and name."""
+
+type PriceSegment = tuple[float, float, float]
+"""A stretch of time with a single price, its start and end timestamps and price."""
+
+
+def rate_fingerprint(rate: RateInfo) -> str:
+    """
+    Get a fingerprint of the tariff names, values and time windows of a rate.
+
+    Computed on the strings MIDAS sent so no dates have to be parsed. Two fetches
+    of a rate with the same fingerprint have the same tariffs. The rate details
+    shown on the sensors are included too.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    records: list[tuple[str, ...]] = [(rate.RateName, rate.RateType, rate.RatePlan_Url)]
+    records.extend(
+        (
+            tariff.ValueName,
+            tariff.DateStart,
+            tariff.DateEnd,
+            tariff.DayStart,
+            tariff.DayEnd,
+            tariff.TimeStart,
+            tariff.TimeEnd,
+            repr(tariff.value),
+        )
+        for tariff in rate.ValueInformation
+    )
+    for record in records:
+        # Separate fields and records with the ASCII unit and record separators
+        digest.update("\x1f".join(record).encode())
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def cheapest_window(
+    segments: list[PriceSegment],
+    earliest: float,
+    latest: float,
+    duration: float,
+) -> tuple[float, float] | None:
+    """
+    Find the contiguous window of `duration` seconds with the lowest average price.
+
+    The window starts no earlier than `earliest`, ends no later than `latest` and
+    only covers time with a known price. `segments` have to be sorted and can't
+    overlap. Returns the start timestamp and average price of the earliest of the
+    cheapest windows, None if no window fits.
+    """
+    best: tuple[float, float] | None = None
+    run_start = 0
+    for i in range(len(segments)):
+        # Search each run of segments without gaps between them on its own
+        if i + 1 < len(segments) and segments[i + 1][0] == segments[i][1]:
+            continue
+        run = segments[run_start : i + 1]
+        run_start = i + 1
+        lo = max(earliest, run[0][0])
+        hi = min(latest, run[-1][1]) - duration
+        if hi < lo:
+            continue
+        found = _cheapest_window_in_run(run, lo, hi, duration)
+        if best is None or found[1] < best[1]:
+            best = found
+    return best
+
+
+def _cheapest_window_in_run(
+    run: list[PriceSegment],
+    lo: float,
+    hi: float,
+    duration: float,
+) -> tuple[float, float]:
+    """
+    Find the cheapest window starting between `lo` and `hi` in a run of segments.
+
+    Runs in linear time. The cost of a window only changes slope when its start or
+    end crosses a segment boundary, so the cheapest window starts either at `lo`,
+    at `hi`, on a boundary or a duration before one. These candidates are visited in
+    order, the cost up to any instant is found from prefix sums of the segment
+    costs with a cursor for each end of the window that only moves forward.
+    """
+    # Cost of the run from its start to the start of each segment
+    prefix = [0.0]
+    for start, end, price in run:
+        prefix.append(prefix[-1] + (end - start) * price)
+    boundaries = [start for start, _, _ in run]
+    boundaries.append(run[-1][1])
+
+    best = (lo, float("inf"))
+    head = tail = 0
+    for start in merge(
+        [lo],
+        (b for b in boundaries if lo < b < hi),
+        (b - duration for b in boundaries if lo < b - duration < hi),
+        [hi],
+    ):
+        end = start + duration
+        while tail + 1 < len(run) and run[tail][1] <= start:
+            tail += 1
+        while head + 1 < len(run) and run[head][1] <= end:
+            head += 1
+        cost = (prefix[head] + (end - run[head][0]) * run[head][2]) - (
+            prefix[tail] + (start - run[tail][0]) * run[tail][2]
+        )
+        if cost / duration < best[1]:
+            best = (start, cost / duration)
+    return best
+
+
+class TariffIndex:
+    """
+    Sorted index over the tariffs of a single rate.
+
+    Built once per coordinator refresh so the active tariffs for any instant can be
+    found with a binary search instead of scanning every tariff of the rate like
+    `RateInfo.GetActiveTariffs` does.
+    """
+
+    def __init__(self, rate: RateInfo) -> None:
+        """Parse and sort the tariffs of the rate."""
+        tariffs = rate.ValueInformation
+        starts = [tariff.GetStart().timestamp() for tariff in tariffs]
+        ends = [tariff.GetEnd().timestamp() for tariff in tariffs]
+        # Sort by start time, keeping the original order of equal starts
+        order = sorted(range(len(tariffs)), key=lambda i: (starts[i], i))
+
+        self._tariffs: list[ValueInfoItem] = [tariffs[i] for i in order]
+        self._positions: list[int] = order
+        self._starts: list[float] = [starts[i] for i in order]
+        self._ends: list[float] = [ends[i] for i in order]
+        # Running maximum of the end times, used to stop scanning back for
+        #   overlapping tariffs as soon as none of the earlier ones can be active
+        self._max_ends: list[float] = []
+        max_end = float("-inf")
+        for end in self._ends:
+            max_end = max(max_end, end)
+            self._max_ends.append(max_end)
+        self._sorted_ends: list[float] = sorted(self._ends)
+
+    def __len__(self) -> int:
+        """Return the number of tariffs in the index."""
+        return len(self._tariffs)
+
+    @property
+    def horizon(self) -> datetime | None:
+        """The end of the last tariff, how far into the future the data reaches."""
+        if len(self._max_ends) == 0:
+            return None
+        return datetime.fromtimestamp(self._max_ends[-1], UTC)
+
+    def active_tariffs(self, time: datetime) -> list[ValueInfoItem]:
+        """
+        Get all tariffs that are active at the specified time.
+
+        Returns the same tariffs in the same order as `RateInfo.GetActiveTariffs`.
+        """
+        timestamp = time.timestamp()
+        # Last tariff that starts strictly before the requested time
+        i = bisect_left(self._starts, timestamp) - 1
+        found: list[int] = []
+        while i >= 0 and self._max_ends[i] > timestamp:
+            if self._ends[i] > timestamp:
+                found.append(i)
+            i -= 1
+        if len(found) > 1:
+            # Overlapping tariffs, return them in the order MIDAS sent them
+            found.sort(key=lambda i: self._positions[i])
+        return [self._tariffs[i] for i in found]
+
+    def active_tariff(self, time: datetime) -> ValueInfoItem | None:
+        """Get the first tariff active at the specified time, if any."""
+        tariffs = self.active_tariffs(time)
+        if len(tariffs) == 0:
+            return None
+        return tariffs[0]
+
+    def next_boundary(self, time: datetime) -> datetime | None:
+        """
+        Get the first tariff start or end strictly after the specified time.
+
+        This is the next instant the active tariffs can change, `None` if there is no
+        tariff data past the specified time.
+        """
+        timestamp = time.timestamp()
+        boundaries: list[float] = []
+        i = bisect_right(self._starts, timestamp)
+        if i < len(self._starts):
+            boundaries.append(self._starts[i])
+        i = bisect_right(self._sorted_ends, timestamp)
+        if i < len(self._sorted_ends):
+            boundaries.append(self._sorted_ends[i])
+        if len(boundaries) == 0:
+            return None
+        return datetime.fromtimestamp(min(boundaries), UTC)
+
+    def is_boundary(self, time: datetime) -> bool:
+        """Return if a tariff starts or ends exactly at the specified time."""
+        timestamp = time.timestamp()
+        for times in (self._starts, self._sorted_ends):
+            i = bisect_left(times, timestamp)
+            if i < len(times) and times[i] == timestamp:
+                return True
+        return False
+
+    def schedule(self, start: datetime, end: datetime) -> tuple[ScheduleEntry, ...]:
+        """Get every tariff active at some point between `start` and `end`, in order."""
+        start_timestamp = start.timestamp()
+        # Every tariff before the first one whose running max end is past `start`
+        #   ended before it, every tariff from the first one starting at or after
+        #   `end` starts after it
+        lo = bisect_right(self._max_ends, start_timestamp)
+        hi = bisect_left(self._starts, end.timestamp())
+        return tuple(
+            (
+                self._tariffs[i].GetStart(),
+                self._tariffs[i].GetEnd(),
+                self._tariffs[i].value,
+                self._tariffs[i].ValueName,
+            )
+            for i in range(lo, hi)
+            if self._ends[i] > start_timestamp
+        )
+
+    def price_segments(self, start: datetime, end: datetime) -> list[PriceSegment]:
+        """
+        Get the price of every stretch of time between `start` and `end`.
+
+        Segments are sorted and don't overlap, time without a tariff is left out.
+        Where tariffs overlap the price is that of the tariff the sensors show.
+        """
+        start_timestamp = start.timestamp()
+        lo = bisect_right(self._max_ends, start_timestamp)
+        hi = bisect_left(self._starts, end.timestamp())
+        found = [i for i in range(lo, hi) if self._ends[i] > start_timestamp]
+        if all(self._starts[b] >= self._ends[a] for a, b in pairwise(found)):
+            return [
+                (self._starts[i], self._ends[i], self._tariffs[i].value) for i in found
+            ]
+
+        # Overlapping tariffs, split the time up on every boundary and find which
+        #   tariff is active in each piece
+        boundaries = sorted(
+            {self._starts[i] for i in found} | {self._ends[i] for i in found}
+        )
+        segments: list[PriceSegment] = []
+        for a, b in pairwise(boundaries):
+            tariff = self.active_tariff(datetime.fromtimestamp((a + b) / 2, UTC))
+            if tariff is not None:
+                segments.append((a, b, tariff.value))
+        return segments
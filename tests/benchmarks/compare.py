@@ -0,0 +1,49 @@
+"""
+Compare two saved benchmark runs.
+
+Usage: python -m tests.benchmarks.compare .benchmarks/<old>.json .benchmarks/<new>.json
+
+Prints the median of every benchmark in both runs and exits with an error when
+any got slower by more than the threshold, 20% unless given as a third argument.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+DEFAULT_THRESHOLD = 0.2
+
+
+def compare(old: dict, new: dict, threshold: float) -> list[str]:
+    """Print the change of every benchmark in both runs, return the regressions."""
+    regressions = []
+    print(f"{'benchmark':<50} {old['commit']:>14} {new['commit']:>14} {'change':>8}")  # noqa: T201
+    for name, result in new["results"].items():
+        if name not in old["results"]:
+            continue
+        before = old["results"][name]["median"]
+        after = result["median"]
+        change = after / before - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = " !"
+        print(  # noqa: T201
+            f"{name:<50} {before * 1000:>11.3f} ms {after * 1000:>11.3f} ms "
+            f"{change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def main(args: list[str]) -> int:
+    """Compare the runs in the files given on the command line."""
+    if len(args) not in (2, 3):
+        print(__doc__)  # noqa: T201
+        return 2
+    old, new = (json.loads(Path(arg).read_text()) for arg in args[:2])
+    threshold = float(args[2]) if len(args) == 3 else DEFAULT_THRESHOLD  # noqa: PLR2004
+    return 1 if compare(old, new, threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
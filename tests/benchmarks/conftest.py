@@ -0,0 +1,148 @@
+"""Fixtures for the benchmarks, and saving their results."""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from collections.abc import Awaitable, Callable, Generator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.midas.api import parse_rate_info
+
+from .rates import RATE_KINDS, synthetic_payload
+
+# Where results are saved, one file per run named after the commit
+RESULTS_DIR = Path(os.environ.get("MIDAS_BENCHMARK_DIR", ".benchmarks"))
+
+RATE_COUNTS = (1, 50, 500)
+"""Numbers of rate ids every benchmark runs with."""
+
+_results: dict[str, dict[str, float | int]] = {}
+
+
+class Bench:
+    """Times a piece of code over several rounds and keeps the result."""
+
+    def __init__(self, name: str) -> None:
+        """Initialize."""
+        self._name = name
+
+    def __call__(
+        self,
+        func: Callable[[], object],
+        rounds: int = 10,
+        setup: Callable[[], object] | None = None,
+    ) -> None:
+        """Time a function, calling `setup` untimed before each round."""
+        times = []
+        for _ in range(rounds):
+            if setup is not None:
+                setup()
+            begin = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - begin)
+        self._save(times)
+
+    async def async_measure(
+        self,
+        func: Callable[[], Awaitable[object]],
+        rounds: int = 10,
+        setup: Callable[[], object] | None = None,
+    ) -> None:
+        """Time a coroutine function, calling `setup` untimed before each round."""
+        times = []
+        for _ in range(rounds):
+            if setup is not None:
+                setup()
+            begin = time.perf_counter()
+            await func()
+            times.append(time.perf_counter() - begin)
+        self._save(times)
+
+    def _save(self, times: list[float]) -> None:
+        """Keep the statistics of the rounds to save at the end of the run."""
+        _results[self._name] = {
+            "min": min(times),
+            "median": statistics.median(times),
+            "mean": statistics.fmean(times),
+            "rounds": len(times),
+        }
+
+
+@pytest.fixture
+def bench(request: pytest.FixtureRequest) -> Bench:
+    """Time code under the name of the benchmark."""
+    return Bench(request.node.name)
+
+
+@pytest.fixture(params=RATE_KINDS)
+def kind(request: pytest.FixtureRequest) -> str:
+    """Get the kind of rate to benchmark with."""
+    return request.param
+
+
+@pytest.fixture(params=RATE_COUNTS)
+def rate_count(request: pytest.FixtureRequest) -> int:
+    """Get the number of rate ids to benchmark with."""
+    return request.param
+
+
+@pytest.fixture
+def synthetic_rates(kind: str) -> Generator[None]:
+    """
+    Serve synthetic rates of the kind of the test.
+
+    Each request decodes a fresh copy of the rate, the way the MIDAS library does.
+    Tariffs start at midnight UTC so they cover the current time.
+    """
+    start = dt_util.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    payloads: dict[str, str] = {}
+
+    def _rate_data(rate_id: str) -> object:
+        if rate_id not in payloads:
+            payloads[rate_id] = synthetic_payload(rate_id, kind, start)
+        return parse_rate_info(payloads[rate_id])
+
+    with patch(
+        "custom_components.midas.api.IntegrationMidasApiClient.async_get_rate_data",
+        side_effect=_rate_data,
+    ):
+        yield
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:  # noqa: ARG001
+    """Save the results of the benchmarks that ran."""
+    if not _results:
+        return
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short=12", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    path = RESULTS_DIR / f"{commit}.json"
+    # Runs of only some of the benchmarks add to the results of the commit
+    results = json.loads(path.read_text())["results"] if path.exists() else {}
+    results.update(_results)
+    path.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "date": dt_util.utcnow().isoformat(),
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": dict(sorted(results.items())),
+            },
+            indent=2,
+        )
+    )
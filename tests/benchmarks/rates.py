@@ -0,0 +1,55 @@
+"""Synthetic rates to benchmark with."""
+
+import json
+from dataclasses import asdict
+from datetime import datetime, timedelta
+
+from california_midasapi.types import RateInfo, ValueInfoItem
+
+from tests.common import make_rate_info, make_tariff
+
+# Days of tariffs every synthetic rate has
+RATE_DAYS = 7
+
+# Static time of use: off peak, peak from 16:00 to 21:00, off peak
+_TOU_DAY = (
+    (0, 16, 0.31, "Off Peak"),
+    (16, 21, 0.49, "Peak"),
+    (21, 24, 0.31, "Off Peak"),
+)
+
+RATE_KINDS = ("tou", "hourly", "realtime")
+"""Kinds of rate, from 3 tariffs a day to 15 minute real time prices."""
+
+
+def synthetic_rate_ids(count: int) -> list[str]:
+    """Get `count` distinct rate ids."""
+    return [f"USCA-BNCH-{i:04d}-0000" for i in range(count)]
+
+
+def synthetic_tariffs(kind: str, start: datetime) -> list[ValueInfoItem]:
+    """Get `RATE_DAYS` days of tariffs of a kind of rate from `start`."""
+    if kind == "tou":
+        return [
+            make_tariff(
+                start + timedelta(days=day, hours=begin),
+                start + timedelta(days=day, hours=end),
+                price,
+                name,
+            )
+            for day in range(RATE_DAYS)
+            for begin, end, price, name in _TOU_DAY
+        ]
+    step = timedelta(hours=1) if kind == "hourly" else timedelta(minutes=15)
+    count = RATE_DAYS * (timedelta(days=1) // step)
+    return make_rate_info(start=start, count=count, step=step).ValueInformation
+
+
+def synthetic_rate(rate_id: str, kind: str, start: datetime) -> RateInfo:
+    """Get a rate of a kind with `RATE_DAYS` days of tariffs from `start`."""
+    return make_rate_info(rate_id, start=start, tariffs=synthetic_tariffs(kind, start))
+
+
+def synthetic_payload(rate_id: str, kind: str, start: datetime) -> str:
+    """Get a rate as the MIDAS server would send it."""
+    return json.dumps(asdict(synthetic_rate(rate_id, kind, start)))
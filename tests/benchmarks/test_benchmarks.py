@@ -0,0 +1,116 @@
+"""Benchmark the MIDAS integration with synthetic rates."""
+
+from collections.abc import AsyncGenerator
+from datetime import timedelta
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import async_get_platforms
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.midas.cache import DATA_RATE_CACHE, MidasRateCache
+from custom_components.midas.const import (
+    CONF_PASSWORD,
+    CONF_RATEIDS,
+    CONF_USERNAME,
+    DOMAIN,
+)
+from custom_components.midas.coordinator import MidasDataUpdateCoordinator
+from custom_components.midas.sensor import MidasPriceSensor
+
+from .conftest import Bench
+from .rates import synthetic_rate_ids
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.usefixtures("synthetic_rates"),
+]
+
+
+@pytest.fixture
+def config_entry(hass: HomeAssistant, rate_count: int) -> MockConfigEntry:
+    """Add an entry for the rate ids, with every fetch going to the server."""
+    hass.data[DATA_RATE_CACHE] = MidasRateCache(hass, ttl=timedelta(0))
+    entry = MockConfigEntry(
+        title="MIDAS Account: bench",
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "bench",
+            CONF_PASSWORD: "bench",
+            CONF_RATEIDS: synthetic_rate_ids(rate_count),
+        },
+    )
+    entry.add_to_hass(hass)
+    return entry
+
+
+@pytest.fixture
+async def coordinator(
+    hass: HomeAssistant, config_entry: MockConfigEntry
+) -> AsyncGenerator[MidasDataUpdateCoordinator]:
+    """Set up the entry and get its coordinator, unloading it afterwards."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    yield config_entry.runtime_data.coordinator
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_bench_setup(
+    hass: HomeAssistant, config_entry: MockConfigEntry, bench: Bench
+) -> None:
+    """Benchmark setting up an entry, the first refresh and its entities."""
+
+    async def _setup() -> None:
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    await bench.async_measure(_setup, rounds=1)
+
+
+async def test_bench_price_sensor_state(
+    hass: HomeAssistant, coordinator: MidasDataUpdateCoordinator, bench: Bench
+) -> None:
+    """Benchmark every price sensor looking up its tariff and building its state."""
+    sensors = [
+        entity
+        for platform in async_get_platforms(hass, DOMAIN)
+        for entity in platform.entities.values()
+        if isinstance(entity, MidasPriceSensor)
+    ]
+
+    def _states() -> None:
+        for sensor in sensors:
+            sensor._resolve_tariff()  # noqa: SLF001
+            _ = sensor.native_value, sensor.extra_state_attributes
+
+    # Cold tariff lookups, the way they are right after a changeover
+    bench(_states, setup=coordinator._active_tariffs.clear)  # noqa: SLF001
+
+
+async def test_bench_boundary_pass(
+    hass: HomeAssistant, coordinator: MidasDataUpdateCoordinator, bench: Bench
+) -> None:
+    """Benchmark a tariff changeover updating every sensor of every rate at once."""
+    # Every synthetic rate changes tariff at the same instants, fire the timer for
+    #   each of the next ones in turn
+    index = next(iter(coordinator.tariff_indexes.values()))
+    fire_times = []
+    boundary = dt_util.utcnow()
+    for _ in range(10):
+        boundary = index.next_boundary(boundary)
+        fire_times.append(boundary + timedelta(seconds=1))
+    fire_times.reverse()
+
+    bench(lambda: async_fire_time_changed(hass, fire_times.pop()))
+
+
+async def test_bench_refresh(
+    coordinator: MidasDataUpdateCoordinator, bench: Bench
+) -> None:
+    """Benchmark a refresh fetching and decoding every rate, all unchanged."""
+    await bench.async_measure(coordinator.async_refresh, rounds=5)
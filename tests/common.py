@@ -0,0 +1,66 @@
+"""Common helpers for testing the MIDAS integration."""
+
+from datetime import UTC, datetime, timedelta
+
+from california_midasapi.types import RateInfo, ValueInfoItem
+
+
+def make_tariff(
+    start: datetime,
+    end: datetime,
+    value: float,
+    name: str = "Tariff",
+) -> ValueInfoItem:
+    """Create a tariff spanning the given UTC times, formatted the way MIDAS does."""
+    return ValueInfoItem(
+        ValueName=name,
+        DateStart=start.strftime("%Y-%m-%d"),
+        DateEnd=end.strftime("%Y-%m-%d"),
+        DayStart=start.strftime("%A"),
+        DayEnd=end.strftime("%A"),
+        TimeStart=start.strftime("%H:%M:%S"),
+        TimeEnd=end.strftime("%H:%M:%S"),
+        value=value,
+        Unit="$/kWh",
+    )
+
+
+def make_rate_info(
+    rate_id: str = "TEST-TEST-TEST-TEST",
+    start: datetime | None = None,
+    count: int = 24,
+    step: timedelta = timedelta(hours=1),
+    tariffs: list[ValueInfoItem] | None = None,
+) -> RateInfo:
+    """
+    Create a rate with `count` back to back tariffs of length `step`.
+
+    Prices cycle so neighbouring tariffs always differ. Pass `tariffs` to use an
+    explicit tariff list instead.
+    """
+    if start is None:
+        start = datetime(2025, 1, 1, tzinfo=UTC)
+    if tariffs is None:
+        tariffs = [
+            make_tariff(
+                start + step * i,
+                start + step * (i + 1),
+                round(0.1 + (i % 7) * 0.01, 5),
+                f"Tariff {i % 7}",
+            )
+            for i in range(count)
+        ]
+    return RateInfo(
+        RateID=rate_id,
+        SystemTime_UTC=start.isoformat(),
+        RateName="Test Rate",
+        RateType="Time of use",
+        Sector="Residential",
+        API_Url="https://midasapi.energy.ca.gov/api/valuedata",
+        RatePlan_Url="https://example.com/rate",
+        EndUse="All",
+        AltRateName1="",
+        AltRateName2="",
+        SignupCloseDate="",
+        ValueInformation=tariffs,
+    )
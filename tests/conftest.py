@@ -1,9 +1,12 @@
 """Fixtures for testing."""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from aiohttp import ClientSession
+from aiohttp.test_utils import TestServer
+from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.midas.const import (
@@ -13,6 +16,9 @@ from custom_components.midas.const import (
     DOMAIN,
 )
 
+from .common import make_rate_info
+from .midas_server import MidasStandIn, StandInSession
+
 pytest_plugins = ["aiohttp.pytest_plugin"]  # makes AiohttpClientMocker work
 
 
@@ -43,3 +49,63 @@ def mock_config_entry() -> MockConfigEntry:
             CONF_RATEIDS: ["TEST-TEST-TEST-TEST"],
         },
     )
+
+
+@pytest.fixture
+def mock_rate_data() -> Generator[AsyncMock]:
+    """Serve a day of hourly tariffs starting 2025-01-01 for every rate id."""
+    with patch(
+        "custom_components.midas.api.IntegrationMidasApiClient.async_get_rate_data",
+        side_effect=lambda rate_id: make_rate_info(rate_id),
+    ) as mock_rate_data:
+        yield mock_rate_data
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the option to run the benchmarks."""
+    parser.addoption(
+        "--benchmarks",
+        action="store_true",
+        default=False,
+        help="run the benchmarks in tests/benchmarks and save their results",
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip the benchmarks unless asked for, they take a while."""
+    if config.getoption("--benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+async def midas_server(
+    hass: HomeAssistant,  # noqa: ARG001
+    socket_enabled: None,  # noqa: ARG001
+) -> AsyncGenerator[MidasStandIn]:
+    """Run a stand-in MIDAS server and send the integration's requests to it."""
+    stand_in = MidasStandIn()
+    stand_in.add_user("test", "test")
+    server = TestServer(stand_in.app, host="127.0.0.1")
+    await server.start_server()
+    async with ClientSession() as session:
+        stand_in_session = StandInSession(session, server.make_url("/"))
+        with (
+            patch(
+                "custom_components.midas.api.async_get_clientsession",
+                return_value=stand_in_session,
+            ),
+            patch(
+                "custom_components.midas.config_flow.async_get_clientsession",
+                return_value=stand_in_session,
+            ),
+            # Retry right away, the freezer stops the event loop clock
+            patch("custom_components.midas.resilience.RETRY_BASE_DELAY", 0),
+        ):
+            yield stand_in
+    await server.close()
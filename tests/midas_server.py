@@ -0,0 +1,229 @@
+"""Local stand-in for the MIDAS server, to test against offline."""
+
+import asyncio
+import base64
+import json
+import random
+import secrets
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+import jwt
+from aiohttp import BasicAuth, ClientSession, web
+from aiohttp.client import _RequestContextManager
+from california_midasapi.types import RateInfo
+from homeassistant.util import dt as dt_util
+from yarl import URL
+
+MIDAS_URL = "https://midasapi.energy.ca.gov"
+
+
+@dataclass
+class Faults:
+    """Trouble the stand-in makes for its clients."""
+
+    latency: float = 0.0
+    """Seconds every response is held back for."""
+    error_rate: float = 0.0
+    """Share of authenticated requests answered with a 503."""
+    throttle_limit: int | None = None
+    """Requests allowed per `throttle_window` before answering with a 429."""
+    throttle_window: float = 60.0
+    retry_after: int = 1
+    """Seconds clients are told to wait after a 429."""
+    token_lifetime: timedelta = timedelta(minutes=10)
+
+
+class MidasStandIn:
+    """
+    Serves the MIDAS endpoints the `california_midasapi` client uses.
+
+    Replays recorded payloads or synthetic `RateInfo`s, and injects latency, server
+    errors, throttling and expired tokens as configured in `faults`. Every request
+    is counted by path in `requests`.
+    """
+
+    def __init__(self, seed: int = 0) -> None:
+        """Initialize."""
+        self.faults = Faults()
+        self.requests: Counter[str] = Counter()
+        self.users: dict[str, str] = {}
+        self._rates: dict[str, str] = {}
+        self._history: dict[str, RateInfo] = {}
+        self._tokens: set[str] = set()
+        self._forced: list[int] = []
+        self._random = random.Random(seed)  # noqa: S311
+        self._throttle: list[float] = []
+        self.app = web.Application(middlewares=[self._faults_middleware])
+        self.app.add_routes(
+            [
+                web.get("/api/token", self._handle_token),
+                web.get("/api/valuedata", self._handle_valuedata),
+                web.get("/api/historicaldata", self._handle_historicaldata),
+                web.post("/api/registration", self._handle_registration),
+            ]
+        )
+
+    def add_user(self, username: str, password: str) -> None:
+        """Add an account that can log in."""
+        self.users[username] = password
+
+    def add_rate(self, rate: RateInfo) -> None:
+        """Serve a rate from the rate info endpoint."""
+        self._rates[rate.RateID] = json.dumps(asdict(rate))
+
+    def add_rate_payload(self, rate_id: str, payload: str) -> None:
+        """Serve a recorded response of the rate info endpoint."""
+        self._rates[rate_id] = payload
+
+    def load_recordings(self, directory: Path) -> None:
+        """Serve every `<rate id>.json` recorded response in a directory."""
+        for path in directory.glob("*.json"):
+            self.add_rate_payload(path.stem, path.read_text())
+
+    def add_history(self, rate: RateInfo) -> None:
+        """Serve the tariffs of a rate from the historical data endpoint."""
+        self._history[rate.RateID] = rate
+
+    def fail_next(self, status: int, count: int = 1) -> None:
+        """Answer the next authenticated requests with an error status."""
+        self._forced.extend([status] * count)
+
+    def expire_tokens(self) -> None:
+        """Reject every token handed out so far, like the server restarting."""
+        self._tokens.clear()
+
+    @web.middleware
+    async def _faults_middleware(
+        self,
+        request: web.Request,
+        handler: Any,
+    ) -> web.StreamResponse:
+        """Count the request and hold it back for the configured latency."""
+        self.requests[request.path] += 1
+        if self.faults.latency > 0:
+            await asyncio.sleep(self.faults.latency)
+        return await handler(request)
+
+    def _check_request(self, request: web.Request) -> web.Response | None:
+        """Get the error response for an authenticated request, if it gets one."""
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if token not in self._tokens or self._token_expired(token):
+            return web.Response(status=401, text="Authorization has been denied.")
+
+        now = asyncio.get_running_loop().time()
+        if self.faults.throttle_limit is not None:
+            window_start = now - self.faults.throttle_window
+            self._throttle = [time for time in self._throttle if time > window_start]
+            if len(self._throttle) >= self.faults.throttle_limit:
+                return web.Response(
+                    status=429,
+                    text="Too many requests.",
+                    headers={"Retry-After": str(self.faults.retry_after)},
+                )
+            self._throttle.append(now)
+
+        if self._forced:
+            return web.Response(status=self._forced.pop(0), text="Forced error.")
+        if self._random.random() < self.faults.error_rate:
+            return web.Response(status=503, text="Service unavailable.")
+        return None
+
+    def _token_expired(self, token: str) -> bool:
+        """Return if a token is past its expiry."""
+        claims = jwt.decode(token, options={"verify_signature": False})
+        return claims["exp"] <= dt_util.utcnow().timestamp()
+
+    async def _handle_token(self, request: web.Request) -> web.Response:
+        """Log in with basic auth and hand out a token in the `Token` header."""
+        try:
+            auth = BasicAuth.decode(request.headers.get("Authorization", ""))
+        except ValueError:
+            return web.Response(status=401, text="Missing credentials.")
+        if self.users.get(auth.login) != auth.password:
+            return web.Response(status=401, text="Invalid credentials.")
+        token = jwt.encode(
+            {
+                "sub": auth.login,
+                "exp": int((dt_util.utcnow() + self.faults.token_lifetime).timestamp()),
+                "jti": secrets.token_hex(8),
+            },
+            "stand-in",
+            algorithm="HS256",
+        )
+        self._tokens.add(token)
+        return web.Response(text="Token issued.", headers={"Token": token})
+
+    async def _handle_valuedata(self, request: web.Request) -> web.Response:
+        """Get a rate, or the list of rates."""
+        if (error := self._check_request(request)) is not None:
+            return error
+        rate_id = request.query.get("id")
+        if rate_id is None:
+            return web.json_response(
+                [
+                    {"RateID": known, "SignalType": "Rates", "Description": ""}
+                    for known in self._rates
+                ]
+            )
+        if rate_id not in self._rates:
+            return web.Response(status=404, text="Rate not found.")
+        return web.Response(text=self._rates[rate_id], content_type="application/json")
+
+    async def _handle_historicaldata(self, request: web.Request) -> web.Response:
+        """Get the tariffs of a rate between two dates, both included."""
+        if (error := self._check_request(request)) is not None:
+            return error
+        rate = self._history.get(request.query.get("id", ""))
+        if rate is None:
+            return web.Response(status=404, text="Rate not found.")
+        start = date.fromisoformat(request.query["startdate"])
+        end = date.fromisoformat(request.query["enddate"])
+        tariffs = [
+            tariff
+            for tariff in rate.ValueInformation
+            if start <= tariff.GetStart().date() <= end
+        ]
+        payload = asdict(rate) | {
+            "ValueInformation": [asdict(tariff) for tariff in tariffs]
+        }
+        return web.json_response(payload)
+
+    async def _handle_registration(self, request: web.Request) -> web.Response:
+        """Create an account."""
+        body = await request.json()
+        username = base64.b64decode(body["username"]).decode()
+        if username in self.users:
+            return web.Response(status=400, text="Username already exists.")
+        self.add_user(username, base64.b64decode(body["password"]).decode())
+        return web.Response(text="User registered.")
+
+
+class StandInSession:
+    """
+    Client session sending requests for the MIDAS server to the stand-in instead.
+
+    Takes the place of the Home Assistant client session handed to the library.
+    """
+
+    def __init__(self, session: ClientSession, base_url: URL) -> None:
+        """Initialize."""
+        self._session = session
+        self._base_url = base_url
+
+    def request(self, method: str, url: str, **kwargs: Any) -> _RequestContextManager:
+        """Make a request, to the stand-in if it was for the MIDAS server."""
+        if url.startswith(MIDAS_URL):
+            url = f"{str(self._base_url).rstrip('/')}{url.removeprefix(MIDAS_URL)}"
+        return self._session.request(method, URL(url), **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> _RequestContextManager:
+        """Make a GET request."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> _RequestContextManager:
+        """Make a POST request."""
+        return self.request("POST", url, **kwargs)
@@ -0,0 +1,192 @@
+"""Test sharing MIDAS login tokens."""
+
+# pyright: reportTypedDictNotRequiredAccess=false
+# ruff: noqa: S101
+
+import json
+from dataclasses import asdict
+from datetime import timedelta
+from http import HTTPStatus
+from typing import Any
+from unittest.mock import AsyncMock
+
+import jwt
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import SOURCE_USER, ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+from yarl import URL
+
+from custom_components.midas.api import IntegrationMidasApiClient
+from custom_components.midas.auth import (
+    TOKEN_LIFETIME,
+    TOKEN_REFRESH_MARGIN,
+    TOKEN_STORAGE_VERSION,
+    async_get_token_manager,
+    credentials_key,
+)
+from custom_components.midas.const import (
+    CONF_PASSWORD,
+    CONF_RATEIDS,
+    CONF_USERNAME,
+    DOMAIN,
+)
+
+from .common import make_rate_info
+
+RATE_ID = "TEST-TEST-TEST-TEST"
+LOGIN_URL = "https://midasapi.energy.ca.gov/api/token"
+RATE_URL = "https://midasapi.energy.ca.gov/api/valuedata"
+
+
+def _make_token(lifetime: timedelta = TOKEN_LIFETIME) -> str:
+    """Make a token expiring `lifetime` from now."""
+    expires = dt_util.utcnow() + lifetime
+    return jwt.encode(
+        {"exp": int(expires.timestamp()), "iat": int(dt_util.utcnow().timestamp())},
+        "secret",
+        algorithm="HS256",
+    )
+
+
+def _mock_login(aioclient_mock: AiohttpClientMocker, token: str) -> None:
+    """Answer logins with `token`."""
+    aioclient_mock.get(
+        LOGIN_URL,
+        status=HTTPStatus.OK,
+        text="Token issued and will expire in 10 minutes.",
+        headers={"Content-Type": "text/plain; charset=utf-8", "Token": token},
+    )
+
+
+def _mock_rate(aioclient_mock: AiohttpClientMocker) -> None:
+    """Answer rate requests with a day of test tariffs."""
+    aioclient_mock.get(
+        RATE_URL,
+        params={"id": RATE_ID, "querytype": "alldata"},
+        status=HTTPStatus.OK,
+        text=json.dumps(asdict(make_rate_info(RATE_ID))),
+    )
+
+
+def _login_count(aioclient_mock: AiohttpClientMocker) -> int:
+    """Count the logins made."""
+    return sum(1 for call in aioclient_mock.mock_calls if call[1] == URL(LOGIN_URL))
+
+
+async def test_config_flow_login_reused_by_setup(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the login checking credentials is reused by the entry's first refresh."""
+    freezer.move_to("2025-01-01T02:30:00+00:00")
+    _mock_login(aioclient_mock, _make_token())
+    _mock_rate(aioclient_mock)
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={"next_step_id": "auth"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_USERNAME: "test", CONF_PASSWORD: "test"}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input={CONF_RATEIDS: [RATE_ID]}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["result"].state is ConfigEntryState.LOADED
+    assert _login_count(aioclient_mock) == 1
+    tokens = async_get_token_manager(hass)
+    assert tokens.logins == 1
+    assert tokens.logins_avoided == 1
+
+
+async def test_saved_token_used_after_restart(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test a token saved before a restart is used without logging in."""
+    token = _make_token()
+    hass_storage[f"{DOMAIN}.tokens"] = {
+        "version": TOKEN_STORAGE_VERSION,
+        "key": f"{DOMAIN}.tokens",
+        "data": {
+            credentials_key("test", "test"): {
+                "token": token,
+                "expires": (dt_util.utcnow() + TOKEN_LIFETIME).isoformat(),
+            }
+        },
+    }
+    _mock_rate(aioclient_mock)
+
+    client = IntegrationMidasApiClient(hass, "test", "test")
+    assert await client.async_get_rate_data(RATE_ID) == make_rate_info(RATE_ID)
+
+    assert _login_count(aioclient_mock) == 0
+    assert aioclient_mock.mock_calls[0][3]["Authorization"] == f"Bearer {token}"
+    assert async_get_token_manager(hass).logins_avoided == 1
+
+
+async def test_token_replaced_before_expiring(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test clients share a token until it gets close to expiring."""
+    _mock_login(aioclient_mock, _make_token())
+    _mock_rate(aioclient_mock)
+    first = IntegrationMidasApiClient(hass, "test", "test")
+    second = IntegrationMidasApiClient(hass, "test", "test")
+
+    await first.async_get_rate_data(RATE_ID)
+    await second.async_get_rate_data(RATE_ID)
+    assert _login_count(aioclient_mock) == 1
+
+    freezer.tick(TOKEN_LIFETIME - TOKEN_REFRESH_MARGIN)
+    aioclient_mock.clear_requests()
+    _mock_login(aioclient_mock, _make_token())
+    _mock_rate(aioclient_mock)
+    await second.async_get_rate_data(RATE_ID)
+    assert _login_count(aioclient_mock) == 1
+
+    # Saved for the next restart
+    await hass.async_block_till_done()
+    stored = hass_storage[f"{DOMAIN}.tokens"]["data"]
+    assert list(stored) == [credentials_key("test", "test")]
+
+
+async def test_rejected_token_replaced(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test a token the server stops accepting is replaced by a new login."""
+    _mock_login(aioclient_mock, _make_token())
+    rate = make_rate_info(RATE_ID)
+    rejected = AsyncMock(
+        side_effect=[
+            AiohttpClientMockResponse(
+                "GET", URL(RATE_URL), status=HTTPStatus.UNAUTHORIZED
+            ),
+            AiohttpClientMockResponse(
+                "GET", URL(RATE_URL), text=json.dumps(asdict(rate))
+            ),
+        ]
+    )
+    aioclient_mock.get(RATE_URL, side_effect=rejected)
+
+    client = IntegrationMidasApiClient(hass, "test", "test")
+    assert await client.async_get_rate_data(RATE_ID) == rate
+
+    assert _login_count(aioclient_mock) == 2  # noqa: PLR2004
@@ -0,0 +1,79 @@
+"""Test the MIDAS calendar."""
+
+# ruff: noqa: S101
+
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+CALENDAR = "calendar.test_test_test_test_tariffs"
+
+
+async def test_calendar_state(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the calendar's event is the active tariff and follows changeovers."""
+    freezer.move_to("2025-01-01T02:50:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(CALENDAR)
+    assert state.state == STATE_ON
+    assert state.attributes["message"] == "Tariff 2"
+    assert state.attributes["description"] == "0.12 USD/kWh"
+
+    freezer.tick(timedelta(minutes=10, seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(CALENDAR).attributes["message"] == "Tariff 3"
+
+    freezer.move_to("2025-01-03T00:00:00+00:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(CALENDAR).state == STATE_OFF
+
+
+async def test_calendar_get_events(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the events in a range are the tariffs overlapping it."""
+    freezer.move_to("2025-01-01T02:50:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        "calendar",
+        "get_events",
+        {
+            "entity_id": CALENDAR,
+            "start_date_time": dt_util.parse_datetime("2025-01-01T04:30:00+00:00"),
+            "end_date_time": dt_util.parse_datetime("2025-01-01T07:00:00+00:00"),
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    events = response[CALENDAR]["events"]
+    assert [event["summary"] for event in events] == [
+        "Tariff 4",
+        "Tariff 5",
+        "Tariff 6",
+    ]
+    assert events[0]["start"] == "2025-01-01T04:00:00+00:00"
+    assert events[-1]["end"] == "2025-01-01T07:00:00+00:00"
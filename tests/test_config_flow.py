@@ -11,6 +11,7 @@ from aiohttp import ServerTimeoutError
 from homeassistant.config_entries import SOURCE_RECONFIGURE, SOURCE_USER
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import entity_registry as er
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
 
@@ -18,12 +19,15 @@ from custom_components.midas.config_flow import MidasFlowHandler
 from custom_components.midas.const import (
     CONF_EMAIL,
     CONF_NAME,
+    CONF_OFFSETS,
     CONF_PASSWORD,
     CONF_RATEIDS,
     CONF_USERNAME,
     DOMAIN,
 )
 
+FUTURE_PRICE_15MIN = "sensor.test_test_test_test_future_energy_price_15_minutes"
+
 
 async def test_config_show_form(hass: HomeAssistant) -> None:
     """Test that the first step menu is served when there's no input."""
@@ -523,3 +527,54 @@ async def test_rateid_validity_check() -> None:
 
     invalid_ids = ["TEST-WRONG-FORMAT"]
     assert config_flow._test_rateids(invalid_ids)  # noqa: SLF001
+
+
+async def test_options_offsets(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+) -> None:
+    """Test that changing the lookahead offsets replaces the future price sensors."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    entity_registry = er.async_get(hass)
+    assert entity_registry.async_get(FUTURE_PRICE_15MIN) is not None
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_OFFSETS: ["30m", "4h", "30M"]},
+    )
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.options == {CONF_OFFSETS: [30, 240]}
+    assert entity_registry.async_get(FUTURE_PRICE_15MIN) is None
+    assert hass.states.get("sensor.test_test_test_test_future_energy_price_30_minutes")
+    assert hass.states.get("sensor.test_test_test_test_future_energy_price_4_hours")
+
+
+async def test_options_invalid_offsets(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+) -> None:
+    """Test that offsets in the wrong format present an error."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_OFFSETS: ["0m"]},
+    )
+    assert result["errors"].get("base") == "offset_invalid"
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={CONF_OFFSETS: ["soon"]},
+    )
+    assert result["errors"].get("base") == "offset_invalid"
+    assert result["type"] == FlowResultType.FORM
@@ -0,0 +1,287 @@
+"""Test the MIDAS data update coordinator."""
+
+# ruff: noqa: S101
+
+import asyncio
+from unittest.mock import patch
+
+from california_midasapi.exception import MidasCommunicationException
+from california_midasapi.types import RateInfo
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.midas.cache import RATE_CACHE_TTL
+from custom_components.midas.const import (
+    CONF_RATEIDS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DOMAIN,
+)
+from custom_components.midas.polling import MIN_POLL_INTERVAL
+from custom_components.midas.sensor import MidasPriceSensor
+
+from .common import make_rate_info
+
+GOOD_RATE = "TEST-TEST-TEST-GOOD"
+BAD_RATE = "TEST-TEST-TEST-BAD1"
+
+
+def _make_entry(
+    mock_config_entry: MockConfigEntry, rate_ids: list[str]
+) -> MockConfigEntry:
+    """Create a config entry for the given rate ids."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        data={**mock_config_entry.data, CONF_RATEIDS: rate_ids},
+    )
+
+
+async def test_coordinator_fetches_concurrently(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test rates are fetched at the same time, up to the concurrency limit."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_rate_data(rate_id: str) -> RateInfo:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return make_rate_info(rate_id)
+
+    entry = _make_entry(
+        mock_config_entry, [f"TEST-TEST-TEST-{i:04d}" for i in range(10)]
+    )
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.midas.api.IntegrationMidasApiClient.async_get_rate_data",
+        side_effect=slow_rate_data,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert max_in_flight == DEFAULT_MAX_CONCURRENT_REQUESTS
+
+
+async def test_coordinator_partial_failure(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a failing rate only affects its own sensors and keeps its last data."""
+    freezer.move_to("2025-01-01T02:30:00+00:00")
+    failing = {BAD_RATE}
+
+    async def rate_data(rate_id: str) -> RateInfo:
+        if rate_id in failing:
+            msg = "Error preforming request: 500"
+            raise MidasCommunicationException(msg)
+        return make_rate_info(rate_id)
+
+    entry = _make_entry(mock_config_entry, [GOOD_RATE, BAD_RATE])
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.midas.api.IntegrationMidasApiClient.async_get_rate_data",
+        side_effect=rate_data,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = entry.runtime_data.coordinator
+        good_sensor = "sensor.test_test_test_good_current_energy_price"
+        bad_sensor = "sensor.test_test_test_bad1_current_energy_price"
+        assert entry.state is ConfigEntryState.LOADED
+        assert coordinator.failed_rate_ids == {BAD_RATE}
+        assert hass.states.get(good_sensor).state == "0.12"
+        assert hass.states.get(bad_sensor).state == STATE_UNAVAILABLE
+
+        # Recovers on the next refresh
+        failing.clear()
+        freezer.tick(RATE_CACHE_TTL)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert hass.states.get(bad_sensor).state == "0.12"
+
+        # Fails again, the last good data still covers now and is served
+        failing.add(BAD_RATE)
+        freezer.tick(RATE_CACHE_TTL)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert coordinator.data[BAD_RATE].RateID == BAD_RATE
+        assert coordinator.stale_rate_ids == {BAD_RATE}
+        assert hass.states.get(good_sensor).state == "0.12"
+        assert hass.states.get(bad_sensor).state == "0.12"
+
+
+async def test_coordinator_serves_stale_data(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the previous data is served until its tariffs run out."""
+    freezer.move_to("2025-01-01T22:30:00+00:00")
+    failing = False
+    sensor = "sensor.test_test_test_test_current_energy_price"
+
+    async def rate_data(rate_id: str) -> RateInfo:
+        if failing:
+            msg = "Connection error"
+            raise MidasCommunicationException(msg)
+        return make_rate_info(rate_id)
+
+    mock_config_entry.add_to_hass(hass)
+    with patch(
+        "custom_components.midas.api.IntegrationMidasApiClient.async_get_rate_data",
+        side_effect=rate_data,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data.coordinator
+
+        # Every rate fails, but the refresh doesn't and is retried soon
+        failing = True
+        freezer.tick(RATE_CACHE_TTL)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert coordinator.last_update_success
+        assert coordinator.stale_rate_ids == {"TEST-TEST-TEST-TEST"}
+        assert coordinator.update_interval == MIN_POLL_INTERVAL
+        assert hass.states.get(sensor).state == "0.11"
+
+        # The sensors go unavailable when the last tariff ends
+        freezer.move_to("2025-01-02T00:00:01+00:00")
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        assert hass.states.get(sensor).state == STATE_UNAVAILABLE
+
+        # And the refresh fails once there is nothing left to serve
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert not coordinator.last_update_success
+
+
+async def test_coordinator_all_rates_failing(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+) -> None:
+    """Test the refresh fails when no rate could be fetched."""
+    mock_config_entry.add_to_hass(hass)
+    with patch(
+        "custom_components.midas.api.IntegrationMidasApiClient.async_get_rate_data",
+        side_effect=MidasCommunicationException("Connection error"),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+
+
+async def test_coordinator_skips_unchanged_rates(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test refreshes only update the sensors of rates whose tariffs changed."""
+    freezer.move_to("2025-01-01T02:30:00+00:00")
+    prices = {GOOD_RATE: 0.0, BAD_RATE: 0.0}
+
+    async def rate_data(rate_id: str) -> RateInfo:
+        rate = make_rate_info(rate_id)
+        rate.ValueInformation[2].value += prices[rate_id]
+        return rate
+
+    entry = _make_entry(mock_config_entry, [GOOD_RATE, BAD_RATE])
+    entry.add_to_hass(hass)
+    with patch(
+        "custom_components.midas.api.IntegrationMidasApiClient.async_get_rate_data",
+        side_effect=rate_data,
+    ):
+        await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = entry.runtime_data.coordinator
+        fingerprints = dict(coordinator.fingerprints)
+
+        with patch.object(
+            MidasPriceSensor,
+            "async_write_ha_state",
+            autospec=True,
+            side_effect=MidasPriceSensor.async_write_ha_state,
+        ) as writes:
+            freezer.tick(RATE_CACHE_TTL)
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            assert writes.call_count == 0
+            assert coordinator.fingerprints == fingerprints
+            assert coordinator.change_counts == {GOOD_RATE: 1, BAD_RATE: 1}
+
+            prices[BAD_RATE] = 0.1
+            freezer.tick(RATE_CACHE_TTL)
+            await coordinator.async_refresh()
+            await hass.async_block_till_done()
+            assert {call.args[0].unique_id for call in writes.call_args_list} == {
+                f"{BAD_RATE}_current",
+                f"{BAD_RATE}_15min",
+                f"{BAD_RATE}_1hour",
+            }
+            assert coordinator.fingerprints[GOOD_RATE] == fingerprints[GOOD_RATE]
+            assert coordinator.fingerprints[BAD_RATE] != fingerprints[BAD_RATE]
+            assert coordinator.change_counts == {GOOD_RATE: 1, BAD_RATE: 2}
+
+    state = hass.states.get("sensor.test_test_test_bad1_current_energy_price")
+    assert state.state == "0.22"
+
+
+async def test_coordinators_share_rate_fetches(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test entries watching the same rates only fetch each rate once."""
+    freezer.move_to("2025-01-01T02:30:00+00:00")
+    fetched: list[str] = []
+
+    async def slow_rate_data(rate_id: str) -> RateInfo:
+        fetched.append(rate_id)
+        # Time is frozen, yield a few times so the other entries catch up
+        for _ in range(10):
+            await asyncio.sleep(0)
+        return make_rate_info(rate_id)
+
+    entries = [
+        _make_entry(mock_config_entry, [GOOD_RATE, BAD_RATE]),
+        _make_entry(mock_config_entry, [GOOD_RATE]),
+        _make_entry(mock_config_entry, [BAD_RATE, GOOD_RATE]),
+    ]
+    for entry in entries:
+        entry.add_to_hass(hass)
+    with patch(
+        "custom_components.midas.api.IntegrationMidasApiClient.async_get_rate_data",
+        side_effect=slow_rate_data,
+    ):
+        # Setting up one entry sets up every entry of the integration
+        await hass.config_entries.async_setup(entries[0].entry_id)
+        await hass.async_block_till_done()
+        assert sorted(fetched) == [BAD_RATE, GOOD_RATE]
+
+        # A new refresh cycle fetches them again, once, even when all entries
+        #   refresh at the same time
+        freezer.tick(RATE_CACHE_TTL)
+        await asyncio.gather(
+            *(entry.runtime_data.coordinator.async_refresh() for entry in entries)
+        )
+        assert sorted(fetched) == [BAD_RATE, BAD_RATE, GOOD_RATE, GOOD_RATE]
+
+    for entry in entries:
+        assert entry.state is ConfigEntryState.LOADED
+        assert set(entry.runtime_data.coordinator.data) == set(
+            entry.runtime_data.rate_ids
+        )
@@ -0,0 +1,103 @@
+"""Test the MIDAS diagnostics and diagnostic sensors."""
+
+# ruff: noqa: S101
+
+from unittest.mock import AsyncMock, PropertyMock, patch
+
+from california_midasapi.exception import MidasCommunicationException
+from california_midasapi.types import RateInfo
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.midas.cache import RATE_CACHE_TTL
+from custom_components.midas.diagnostics import async_get_config_entry_diagnostics
+
+from .common import make_rate_info
+
+RATE_ID = "TEST-TEST-TEST-TEST"
+CURRENT_PRICE = "sensor.test_test_test_test_current_energy_price"
+FETCH_LATENCY = "sensor.test_test_test_test_fetch_latency"
+REFRESH_OUTCOME = "sensor.test_test_test_test_refresh_outcome"
+
+
+async def test_diagnostics(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the diagnostics show the metrics without the credentials."""
+    freezer.move_to("2025-01-01T02:30:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+
+    assert diagnostics["entry"]["data"]["username"] == REDACTED
+    assert diagnostics["entry"]["data"]["password"] == REDACTED
+    assert diagnostics["rates"][RATE_ID]["failed"] is False
+    assert diagnostics["rates"][RATE_ID]["change_count"] == 1
+    assert diagnostics["timers"]["tariff_changeovers"] == 1
+    metrics = diagnostics["metrics"]
+    assert metrics["refresh_outcomes"] == {"success": 1}
+    assert metrics["fetch_latency"][RATE_ID]["count"] == 1
+    assert sum(metrics["fetch_latency"][RATE_ID]["buckets"].values()) == 1
+    assert RATE_ID in metrics["index_build_time"]
+    assert metrics["state_writes"][CURRENT_PRICE] > 0
+    assert CURRENT_PRICE in metrics["state_write_time"]
+
+
+async def test_diagnostic_sensors(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the diagnostic sensors are written after every refresh."""
+    freezer.move_to("2025-01-01T02:30:00+00:00")
+    failing = False
+
+    async def rate_data(rate_id: str) -> RateInfo:
+        if failing:
+            msg = "Connection error"
+            raise MidasCommunicationException(msg)
+        return make_rate_info(rate_id)
+
+    mock_config_entry.add_to_hass(hass)
+    with (
+        patch(
+            "homeassistant.helpers.entity.Entity.entity_registry_enabled_default",
+            new_callable=PropertyMock,
+            return_value=True,
+        ),
+        patch(
+            "custom_components.midas.api.IntegrationMidasApiClient.async_get_rate_data",
+            side_effect=rate_data,
+        ),
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+        coordinator = mock_config_entry.runtime_data.coordinator
+
+        assert float(hass.states.get(FETCH_LATENCY).state) >= 0
+        assert hass.states.get(FETCH_LATENCY).attributes["requests"] == 1
+        assert hass.states.get(REFRESH_OUTCOME).state == "success"
+        writes = coordinator.metrics.state_writes[CURRENT_PRICE]
+
+        # Same data, the price sensors aren't written but the latency is
+        freezer.tick(RATE_CACHE_TTL)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert hass.states.get(FETCH_LATENCY).attributes["requests"] == 2  # noqa: PLR2004
+        assert coordinator.metrics.state_writes[CURRENT_PRICE] == writes
+
+        # Shown as failed while every rate fails and its old data is served
+        failing = True
+        freezer.tick(RATE_CACHE_TTL)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert hass.states.get(FETCH_LATENCY).attributes["requests"] == 3  # noqa: PLR2004
+        assert hass.states.get(REFRESH_OUTCOME).state == "failed"
+        assert coordinator.metrics.refresh_outcomes == {"success": 2, "stale": 1}
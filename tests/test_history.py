@@ -0,0 +1,133 @@
+"""Test the MIDAS price history import."""
+
+# ruff: noqa: S101
+
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.midas.const import DOMAIN
+from custom_components.midas.history import (
+    HISTORY_BATCH_DAYS,
+    hourly_statistics,
+    statistic_id,
+)
+from custom_components.midas.services import SERVICE_IMPORT_HISTORY
+
+from .common import make_rate_info
+
+RATE_ID = "TEST-TEST-TEST-TEST"
+STATISTIC_ID = "midas:test_test_test_test_price"
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Recorder,
+    enable_custom_integrations: None,
+) -> None:
+    """Enable the custom integration, after the recorder which has to be first."""
+
+
+def _historical_rate_data(rate_id: str, start: date, end: date) -> object:
+    """Serve hourly tariffs for every day from `start` to `end`."""
+    return make_rate_info(
+        rate_id,
+        start=datetime(start.year, start.month, start.day, tzinfo=UTC),
+        count=((end - start).days + 1) * 24,
+    )
+
+
+def _last_imported_hour(hass: HomeAssistant) -> datetime:
+    """Get the start of the last hour in the statistics, runs in the executor."""
+    last = get_last_statistics(hass, 1, STATISTIC_ID, False, {"mean"})  # noqa: FBT003
+    return datetime.fromtimestamp(last[STATISTIC_ID][0]["start"], UTC)
+
+
+def test_hourly_statistics() -> None:
+    """Test hours get the time weighted mean, minimum and maximum price."""
+    # Tariffs of 0.10, 0.11, 0.12 and 0.13 for 20 minutes each
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    rate = make_rate_info(start=start, count=4, step=timedelta(minutes=20))
+
+    statistics = hourly_statistics(rate, start, start + timedelta(hours=3))
+
+    assert statistics == [
+        {
+            "start": start,
+            "mean": pytest.approx(0.11),
+            "min": 0.1,
+            "max": 0.12,
+        },
+        {
+            "start": start + timedelta(hours=1),
+            "mean": pytest.approx(0.13),
+            "min": 0.13,
+            "max": 0.13,
+        },
+    ]
+    assert statistic_id(RATE_ID) == STATISTIC_ID
+
+
+async def test_import_history(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test history is imported in batches on setup, then resumed."""
+    freezer.move_to("2025-03-01T00:30:00+00:00")
+    with (
+        patch(
+            "custom_components.midas.api.IntegrationMidasApiClient.async_get_historical_rate_data",
+            side_effect=_historical_rate_data,
+        ) as mock_history,
+        patch(
+            "custom_components.midas.history.async_add_external_statistics",
+            wraps=async_add_external_statistics,
+        ) as mock_add,
+        patch("custom_components.midas.history.HISTORY_IMPORT_DAYS", 90),
+    ):
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+        await async_wait_recording_done(hass)
+
+        # 90 days back from the current hour, never more than a batch at a time
+        assert mock_history.call_count == 3  # noqa: PLR2004
+        assert all(
+            len(call.args[2]) <= HISTORY_BATCH_DAYS * 24
+            for call in mock_add.call_args_list
+        )
+        assert sum(len(call.args[2]) for call in mock_add.call_args_list) == 90 * 24
+        assert await recorder_mock.async_add_executor_job(
+            _last_imported_hour, hass
+        ) == datetime(2025, 2, 28, 23, tzinfo=UTC)
+
+        # Two days later only the missing hours are requested
+        freezer.move_to("2025-03-03T00:30:00+00:00")
+        mock_history.reset_mock()
+        await hass.services.async_call(
+            DOMAIN, SERVICE_IMPORT_HISTORY, {"rate_id": RATE_ID}, blocking=True
+        )
+        await hass.async_block_till_done(wait_background_tasks=True)
+        await async_wait_recording_done(hass)
+
+        mock_history.assert_called_once_with(
+            RATE_ID, date(2025, 3, 1), date(2025, 3, 3)
+        )
+        assert await recorder_mock.async_add_executor_job(
+            _last_imported_hour, hass
+        ) == datetime(2025, 3, 2, 23, tzinfo=UTC)
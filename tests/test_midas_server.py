@@ -0,0 +1,129 @@
+"""Test the integration end to end against the stand-in MIDAS server."""
+
+# ruff: noqa: S101
+
+import time
+from datetime import UTC, date, datetime
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.midas.api import IntegrationMidasApiClient
+from custom_components.midas.cache import RATE_CACHE_TTL
+from custom_components.midas.const import CONF_RATEIDS
+
+from .common import make_rate_info
+from .midas_server import MidasStandIn
+
+RATE_ID = "TEST-TEST-TEST-TEST"
+CURRENT_PRICE = "sensor.test_test_test_test_current_energy_price"
+
+
+async def test_stand_in_setup_and_token_expiry(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    midas_server: MidasStandIn,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the entry sets up and logs in again when its token is rejected."""
+    freezer.move_to("2025-01-01T02:10:00+00:00")
+    midas_server.add_rate(make_rate_info(RATE_ID))
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(CURRENT_PRICE).state == "0.12"
+    assert midas_server.requests == {"/api/token": 1, "/api/valuedata": 1}
+
+    midas_server.expire_tokens()
+    freezer.tick(RATE_CACHE_TTL)
+    await mock_config_entry.runtime_data.coordinator.async_refresh()
+
+    assert mock_config_entry.runtime_data.coordinator.last_update_success
+    assert midas_server.requests == {"/api/token": 2, "/api/valuedata": 3}
+
+
+async def test_stand_in_errors_and_throttling(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    midas_server: MidasStandIn,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test server errors and throttling fail the refresh and recover after."""
+    # Every refresh is after the shared rate cache expired, so it reaches the server
+    freezer.move_to("2025-01-01T02:10:00+00:00")
+    midas_server.add_rate(make_rate_info(RATE_ID))
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data.coordinator
+
+    midas_server.fail_next(503)
+    freezer.tick(RATE_CACHE_TTL)
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert hass.states.get(CURRENT_PRICE).state == STATE_UNAVAILABLE
+
+    midas_server.faults.throttle_limit = 1
+    midas_server.faults.throttle_window = 3600
+    freezer.tick(RATE_CACHE_TTL)
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    freezer.tick(RATE_CACHE_TTL)
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+    midas_server.faults.throttle_limit = None
+    freezer.tick(RATE_CACHE_TTL)
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert hass.states.get(CURRENT_PRICE).state == "0.12"
+
+
+async def test_stand_in_latency_at_scale(
+    hass: HomeAssistant,
+    midas_server: MidasStandIn,
+) -> None:
+    """Test many rates are fetched a few at a time from a slow server."""
+    rate_ids = [f"USCA-TEST-{i:04d}-0000" for i in range(20)]
+    start = dt_util.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    for rate_id in rate_ids:
+        midas_server.add_rate(make_rate_info(rate_id, start=start))
+    midas_server.faults.latency = 0.02
+    entry = MockConfigEntry(
+        domain="midas",
+        data={"username": "test", "password": "test", CONF_RATEIDS: rate_ids},
+    )
+    entry.add_to_hass(hass)
+
+    begin = time.perf_counter()
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    elapsed = time.perf_counter() - begin
+
+    assert set(entry.runtime_data.coordinator.data) == set(rate_ids)
+    assert midas_server.requests["/api/valuedata"] == len(rate_ids)
+    # Requests are limited to 4 at a time, after logging in once
+    assert elapsed >= 0.02 * (1 + len(rate_ids) / 4)
+
+
+async def test_stand_in_historical_data(
+    hass: HomeAssistant,
+    midas_server: MidasStandIn,
+) -> None:
+    """Test the client decodes the tariffs of the requested days."""
+    midas_server.add_history(
+        make_rate_info(RATE_ID, start=datetime(2024, 6, 1, tzinfo=UTC), count=72)
+    )
+    client = IntegrationMidasApiClient(hass, "test", "test")
+
+    rate = await client.async_get_historical_rate_data(
+        RATE_ID, date(2024, 6, 2), date(2024, 6, 2)
+    )
+
+    assert rate.RateID == RATE_ID
+    assert len(rate.ValueInformation) == 24  # noqa: PLR2004
+    assert rate.ValueInformation[0].GetStart() == datetime(2024, 6, 2, tzinfo=UTC)
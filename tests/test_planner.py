@@ -0,0 +1,190 @@
+"""Test the MIDAS deferrable load planner."""
+
+# ruff: noqa: S101
+
+import random
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.midas.const import DOMAIN
+from custom_components.midas.planner import DeferrableLoad, LoadPlanner, slot_prices
+from custom_components.midas.services import SERVICE_PLAN_LOADS
+
+RATE_ID = "TEST-TEST-TEST-TEST"
+# 48 hours of 5 minute slots
+SLOTS = 576
+SLOT_HOURS = 5 / 60
+
+
+def test_slot_prices() -> None:
+    """Test slot prices are time weighted and unknown where there are gaps."""
+    segments = [(0.0, 90.0, 0.1), (90.0, 120.0, 0.4), (180.0, 300.0, 0.2)]
+
+    assert slot_prices(segments, 0.0, 60.0, 5) == [
+        0.1,
+        pytest.approx(0.25),
+        None,
+        0.2,
+        0.2,
+    ]
+
+
+def test_planner_respects_power_limit() -> None:
+    """Test loads that can't run together are spread over the cheap slots."""
+    planner = LoadPlanner([0.5, 0.1, 0.1, 0.5, 0.5, 0.2, 0.2, 0.5], 1, power_limit=3)
+    washer = DeferrableLoad(name="washer", power=2, slots=2, deadline=8)
+    dryer = DeferrableLoad(name="dryer", power=2, slots=2, deadline=8)
+
+    starts = planner.plan([washer, dryer])
+
+    assert sorted(starts.values()) == [1, 5]
+    assert planner.cost(washer, starts["washer"]) + planner.cost(
+        dryer, starts["dryer"]
+    ) == pytest.approx(1.2)
+
+
+def test_planner_deadlines_and_gaps() -> None:
+    """Test loads finish by their deadline, avoid unknown prices or don't run."""
+    planner = LoadPlanner([0.3, 0.2, None, 0.1, 0.1, 0.1], 1)
+    early = DeferrableLoad(name="early", power=1, slots=2, deadline=3)
+    late = DeferrableLoad(name="late", power=1, slots=3, deadline=6)
+    impossible = DeferrableLoad(name="impossible", power=1, slots=4, deadline=6)
+
+    assert planner.plan([early, late, impossible]) == {"early": 0, "late": 3}
+
+
+def test_planner_plans_are_feasible() -> None:
+    """Test random plans never break a power limit or a deadline."""
+    rng = random.Random(7)  # noqa: S311
+    for _ in range(20):
+        prices = [rng.randint(5, 40) / 100 for _ in range(96)]
+        loads = [
+            DeferrableLoad(
+                name=str(i),
+                power=rng.choice([1.0, 1.5, 3.0, 7.2]),
+                slots=rng.randint(1, 24),
+                deadline=rng.randint(24, 96),
+            )
+            for i in range(6)
+        ]
+        planner = LoadPlanner(prices, SLOT_HOURS, power_limit=9)
+
+        starts = planner.plan(loads)
+
+        usage = [0.0] * len(prices)
+        for load in loads:
+            if load.name not in starts:
+                continue
+            assert starts[load.name] + load.slots <= load.deadline
+            for slot in range(starts[load.name], starts[load.name] + load.slots):
+                usage[slot] += load.power
+        assert max(usage) <= 9 + 1e-9
+
+
+def test_planner_benchmark() -> None:
+    """Benchmark planning a household's loads over 48 hours of 5 minute slots."""
+    rng = random.Random(1)  # noqa: S311
+    prices = [rng.randint(5, 40) / 100 for _ in range(SLOTS)]
+    loads = [
+        DeferrableLoad(name="ev", power=7.2, slots=60, deadline=SLOTS),
+        DeferrableLoad(name="dishwasher", power=1.2, slots=24, deadline=288),
+        DeferrableLoad(name="washer", power=0.8, slots=18, deadline=288),
+        DeferrableLoad(name="dryer", power=3.0, slots=12, deadline=SLOTS),
+        DeferrableLoad(name="pool", power=1.5, slots=96, deadline=SLOTS),
+        DeferrableLoad(name="water heater", power=4.5, slots=36, deadline=SLOTS),
+    ]
+
+    begin = time.perf_counter()
+    LoadPlanner(prices, SLOT_HOURS, power_limit=9.6).plan(loads)
+    elapsed = time.perf_counter() - begin
+
+    assert elapsed < 0.05  # noqa: PLR2004
+
+
+async def test_plan_loads(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the service returns a schedule with its expected cost."""
+    freezer.move_to("2025-01-01T00:30:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PLAN_LOADS,
+        {
+            "rate_id": RATE_ID,
+            "loads": [
+                {"name": "dishwasher", "energy": 2, "power": 2, "duration": "01:00"},
+                {"name": "dryer", "energy": 3, "power": 3},
+                {"name": "pool", "energy": 1, "power": 1, "duration": "02:00"},
+            ],
+            "power_limit": 4,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    # The test data has the cheapest hours at 07:00, 14:00 and 21:00, 0.10 each
+    assert response == {
+        "schedule": [
+            {
+                "name": "dryer",
+                "start": "2025-01-01T07:00:00+00:00",
+                "end": "2025-01-01T08:00:00+00:00",
+                "power": 3.0,
+                "cost": pytest.approx(0.3),
+            },
+            {
+                "name": "pool",
+                "start": "2025-01-01T07:00:00+00:00",
+                "end": "2025-01-01T09:00:00+00:00",
+                "power": 0.5,
+                "cost": pytest.approx(0.105),
+            },
+            {
+                "name": "dishwasher",
+                "start": "2025-01-01T14:00:00+00:00",
+                "end": "2025-01-01T15:00:00+00:00",
+                "power": 2.0,
+                "cost": pytest.approx(0.2),
+            },
+        ],
+        "unscheduled": [],
+        "total_cost": pytest.approx(0.605),
+    }
+
+
+async def test_plan_loads_over_power(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+) -> None:
+    """Test a load that can't use its energy within its power cap is rejected."""
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PLAN_LOADS,
+            {
+                "rate_id": RATE_ID,
+                "loads": [
+                    {"name": "ev", "energy": 30, "power": 7.2, "duration": "01:00"}
+                ],
+            },
+            blocking=True,
+            return_response=True,
+        )
@@ -0,0 +1,79 @@
+"""Test the MIDAS adaptive polling policy."""
+
+# ruff: noqa: S101
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.midas.polling import (
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    PUBLICATION_GRACE,
+    AdaptivePollingPolicy,
+)
+from custom_components.midas.tariffs import TariffIndex
+
+from .common import make_rate_info
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+RATE_ID = "TEST-TEST-TEST-TEST"
+
+
+def test_policy_long_horizon_polls_rarely() -> None:
+    """Test a rate with months of data is polled at the maximum interval."""
+    policy = AdaptivePollingPolicy()
+    index = TariffIndex(make_rate_info(start=START, count=90, step=timedelta(days=1)))
+    policy.observe(RATE_ID, index, START)
+
+    assert policy.next_interval(START) == MAX_POLL_INTERVAL
+
+
+def test_policy_short_horizon_polls_before_running_out() -> None:
+    """Test a rate about to run out of data is polled well before it does."""
+    policy = AdaptivePollingPolicy()
+    index = TariffIndex(make_rate_info(start=START, count=2))
+    policy.observe(RATE_ID, index, START)
+
+    assert policy.next_interval(START) == timedelta(hours=1)
+    assert policy.next_interval(START + timedelta(hours=2)) == MIN_POLL_INTERVAL
+
+
+def test_policy_follows_publication_cadence() -> None:
+    """Test a day ahead rate is polled right after its next expected publication."""
+    policy = AdaptivePollingPolicy()
+    # Publishes the next two days of hourly tariffs every day at 14:00
+    published = START + timedelta(hours=14)
+    for day in range(3):
+        now = published + timedelta(days=day)
+        rate = make_rate_info(start=START, count=24 * (day + 2))
+        policy.observe(RATE_ID, TariffIndex(rate), now)
+    assert policy.cadence(RATE_ID) == timedelta(days=1)
+
+    # Polls right after the next publication instead of waiting for half the horizon
+    now += timedelta(hours=1)
+    expected = timedelta(hours=23) + PUBLICATION_GRACE
+    assert policy.next_interval(now) == min(MAX_POLL_INTERVAL, expected)
+    now += timedelta(hours=20)
+    assert policy.next_interval(now) == timedelta(hours=3) + PUBLICATION_GRACE
+
+
+async def test_coordinator_reports_next_refresh(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the coordinator polls based on the data and reports when it will."""
+    freezer.move_to("2025-01-01T20:00:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    coordinator = mock_config_entry.runtime_data.coordinator
+    # The day of test data runs out in 4 hours
+    assert coordinator.update_interval == timedelta(hours=2)
+    assert coordinator.next_refresh == datetime(2025, 1, 1, 22, tzinfo=UTC)
@@ -0,0 +1,97 @@
+"""Test how much the MIDAS entities write to the recorder."""
+
+# ruff: noqa: S101
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, PropertyMock, patch
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import (
+    StateAttributes,
+    States,
+    StatesMeta,
+)
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(
+    recorder_mock: Recorder,
+    enable_custom_integrations: None,
+) -> None:
+    """Enable the custom integration, after the recorder which has to be first."""
+
+
+async def test_recorder_rows_per_day(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a day of tariffs records each entity's static attributes not at all."""
+    freezer.move_to("2025-01-01T00:00:30+00:00")
+    # Every attribute set written, as it would be recorded without exclusions
+    written: list[bytes] = []
+
+    @callback
+    def _state_changed(event: Event) -> None:
+        if event.data["entity_id"].startswith("sensor.test_test_test_test"):
+            written.append(json_bytes(event.data["new_state"].attributes))
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _state_changed)
+    with patch(
+        "homeassistant.helpers.entity.Entity.entity_registry_enabled_default",
+        new_callable=PropertyMock,
+        return_value=True,
+    ):
+        mock_config_entry.add_to_hass(hass)
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    for _ in range(24):
+        freezer.tick(timedelta(hours=1))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    def _recorded() -> tuple[int, list[bytes]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            rows = (
+                session.query(States.state_id)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id.like("sensor.test_test_test_test%"))
+                .count()
+            )
+            attributes = [
+                row.shared_attrs.encode()
+                for row in session.query(StateAttributes.shared_attrs)
+                .join(States, States.attributes_id == StateAttributes.attributes_id)
+                .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+                .filter(StatesMeta.entity_id.like("sensor.test_test_test_test%"))
+                .distinct()
+            ]
+        return rows, attributes
+
+    rows, attributes = await recorder_mock.async_add_executor_job(_recorded)
+
+    # A row for every state write, none only to update housekeeping attributes
+    assert rows == len(written)
+    # Before excluding attributes the recorder would have stored every distinct
+    #   attribute set, the static rate details making each of them larger
+    before = set(written)
+    assert len(attributes) < len(before)
+    assert sum(map(len, attributes)) < sum(map(len, before)) / 2
+    assert all(b"rate_url" not in shared for shared in attributes)
+    assert all(b"update_loop_next_time" not in shared for shared in attributes)
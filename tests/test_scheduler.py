@@ -0,0 +1,49 @@
+"""Test the MIDAS tariff boundary scheduler."""
+
+# ruff: noqa: S101
+
+from datetime import timedelta
+from unittest.mock import AsyncMock
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.midas.const import CONF_RATEIDS, DOMAIN
+
+RATE_COUNT = 100
+
+
+async def test_scheduler_timers_do_not_scale_with_entities(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test hundreds of sensors on the same boundaries share a single timer."""
+    freezer.move_to("2025-01-01T02:50:00+00:00")
+    rate_ids = [f"TEST-TEST-TEST-{i:04d}" for i in range(RATE_COUNT)]
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={**mock_config_entry.data, CONF_RATEIDS: rate_ids},
+    )
+    entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    scheduler = entry.runtime_data.coordinator.scheduler
+    assert scheduler.timer_count == 1
+    # The current and 1 hour sensors change at 03:00, the 15 minute ones at 03:45
+    assert scheduler.pending_boundaries == 2  # noqa: PLR2004
+
+    freezer.tick(timedelta(minutes=10, seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert scheduler.timer_count == 1
+    for i in range(RATE_COUNT):
+        state = hass.states.get(f"sensor.test_test_test_{i:04d}_current_energy_price")
+        assert state.state == "0.13"
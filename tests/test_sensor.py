@@ -1,4 +1,170 @@
 """Test the MIDAS sensors."""
 
-# TODO test sensor goes unavailable when no data
-# TODO test update loop (sensor updates right on the next rate start)
+# ruff: noqa: S101
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, PropertyMock, patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.midas.tariffs import TariffIndex
+
+CURRENT_PRICE = "sensor.test_test_test_test_current_energy_price"
+FUTURE_PRICE_15MIN = "sensor.test_test_test_test_future_energy_price_15_minutes"
+FORECAST = "sensor.test_test_test_test_price_forecast"
+
+
+async def test_sensor_state(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the sensors show the active tariff for their offset."""
+    freezer.move_to("2025-01-01T02:50:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(CURRENT_PRICE)
+    assert state.state == "0.12"
+    assert state.attributes["tariff_name"] == "Tariff 2"
+    assert state.attributes["start_time"] == dt_util.parse_datetime(
+        "2025-01-01T02:00:00+00:00"
+    )
+    assert hass.states.get(FUTURE_PRICE_15MIN).state == "0.13"
+
+
+async def test_sensor_unavailable_without_tariffs(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the sensors go unavailable when no tariff covers the current time."""
+    freezer.move_to("2025-01-03T00:00:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get(CURRENT_PRICE).state == STATE_UNAVAILABLE
+
+
+async def test_sensor_updates_on_tariff_change(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the sensors update right on the start of the next tariff."""
+    freezer.move_to("2025-01-01T02:50:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get(CURRENT_PRICE).state == "0.12"
+
+    freezer.tick(timedelta(minutes=10, seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(CURRENT_PRICE).state == "0.13"
+
+
+async def test_sensor_tariff_lookups_shared_per_offset(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the sensors of an offset share one tariff lookup per changeover."""
+    freezer.move_to("2025-01-01T02:50:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    with patch(
+        "homeassistant.helpers.entity.Entity.entity_registry_enabled_default",
+        new_callable=PropertyMock,
+        return_value=True,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+    # Price, tariff name, start and end for 3 offsets plus the forecast and the 2
+    #   diagnostic sensors
+    assert len(hass.states.async_entity_ids("sensor")) == 15  # noqa: PLR2004
+
+    with patch.object(
+        TariffIndex,
+        "active_tariffs",
+        autospec=True,
+        side_effect=TariffIndex.active_tariffs,
+    ) as lookups:
+        # The current and 1 hour tariffs change over, 8 sensors update
+        freezer.tick(timedelta(minutes=10, seconds=1))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+    assert hass.states.get(CURRENT_PRICE).state == "0.13"
+    assert lookups.call_count == 2  # noqa: PLR2004
+
+
+async def test_forecast_sensor_state(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the forecast sensor lists the upcoming tariffs."""
+    freezer.move_to("2025-01-01T02:50:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(FORECAST)
+    assert state.state == "2025-01-02T00:00:00+00:00"
+    schedule = state.attributes["schedule"]
+    assert len(schedule) == 22  # noqa: PLR2004
+    assert schedule[0] == (
+        dt_util.parse_datetime("2025-01-01T02:00:00+00:00"),
+        dt_util.parse_datetime("2025-01-01T03:00:00+00:00"),
+        0.12,
+        "Tariff 2",
+    )
+
+
+async def test_forecast_sensor_written_on_schedule_change(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the forecast sensor skips tariff changeovers and refreshes of the same schedule."""  # noqa: E501
+    freezer.move_to("2025-01-01T02:50:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = mock_config_entry.runtime_data.coordinator
+    last_updated = hass.states.get(FORECAST).last_updated
+
+    # Tariff changeover
+    freezer.tick(timedelta(minutes=10, seconds=1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(CURRENT_PRICE).state == "0.13"
+    assert hass.states.get(FORECAST).last_updated == last_updated
+
+    # The tariff that ended drops out of the schedule on the next refresh
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get(FORECAST)
+    assert state.last_updated != last_updated
+    assert len(state.attributes["schedule"]) == 21  # noqa: PLR2004
+    last_updated = state.last_updated
+
+    # Nothing changed since
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert hass.states.get(FORECAST).last_updated == last_updated
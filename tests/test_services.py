@@ -0,0 +1,119 @@
+"""Test the MIDAS services."""
+
+# ruff: noqa: S101
+
+import random
+from unittest.mock import AsyncMock
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.midas.const import DOMAIN
+from custom_components.midas.services import SERVICE_FIND_CHEAPEST_WINDOW
+from custom_components.midas.tariffs import PriceSegment, cheapest_window
+
+RATE_ID = "TEST-TEST-TEST-TEST"
+
+
+def _brute_force_cheapest(
+    segments: list[PriceSegment], earliest: float, latest: float, duration: float
+) -> float | None:
+    """Find the lowest average price by trying every whole second."""
+    best = None
+    for start in range(int(earliest), int(latest - duration) + 1):
+        end = start + duration
+        covered = sum(max(0.0, min(end, b) - max(start, a)) for a, b, _ in segments)
+        if covered < duration:
+            continue
+        cost = sum(
+            max(0.0, min(end, b) - max(start, a)) * price for a, b, price in segments
+        )
+        if best is None or cost / duration < best:
+            best = cost / duration
+    return best
+
+
+def test_cheapest_window_matches_brute_force() -> None:
+    """Test the prefix sum search finds the same price as trying every start."""
+    rng = random.Random(42)  # noqa: S311
+    for _ in range(20):
+        segments: list[PriceSegment] = []
+        time = 0.0
+        for _ in range(rng.randint(1, 12)):
+            # Some gaps between segments
+            time += rng.choice([0, 0, 0, 60])
+            length = rng.randint(1, 8) * 30
+            segments.append((time, time + length, rng.randint(1, 20) / 100))
+            time += length
+        duration = rng.randint(1, 10) * 45
+        earliest = rng.randint(0, 100)
+
+        found = cheapest_window(segments, earliest, time, duration)
+        expected = _brute_force_cheapest(segments, earliest, time, duration)
+        if expected is None:
+            assert found is None
+        else:
+            assert found is not None
+            assert found[1] == pytest.approx(expected)
+
+
+async def test_find_cheapest_window(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the service returns the earliest cheapest window."""
+    freezer.move_to("2025-01-01T00:30:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_FIND_CHEAPEST_WINDOW,
+        {"rate_id": RATE_ID, "duration": {"hours": 2}},
+        blocking=True,
+        return_response=True,
+    )
+
+    # Tariff 0 then tariff 1, hourly prices 0.10 and 0.11
+    assert response == {
+        "start": "2025-01-01T07:00:00+00:00",
+        "end": "2025-01-01T09:00:00+00:00",
+        "average_price": pytest.approx(0.105),
+    }
+
+
+async def test_find_cheapest_window_errors(
+    hass: HomeAssistant,
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the service errors on unknown rates and windows that don't fit."""
+    freezer.move_to("2025-01-01T20:00:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FIND_CHEAPEST_WINDOW,
+            {"rate_id": "TEST-TEST-TEST-NONE", "duration": {"hours": 2}},
+            blocking=True,
+            return_response=True,
+        )
+    # The test data runs out in 4 hours
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_FIND_CHEAPEST_WINDOW,
+            {"rate_id": RATE_ID, "duration": {"hours": 5}},
+            blocking=True,
+            return_response=True,
+        )
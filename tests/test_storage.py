@@ -0,0 +1,104 @@
+"""Test saving and restoring MIDAS rates."""
+
+# ruff: noqa: S101
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+from california_midasapi.types import RateInfo
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.midas.storage import (
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    rate_from_store,
+    rate_to_store,
+)
+
+from .common import make_rate_info
+
+CURRENT_PRICE = "sensor.test_test_test_test_current_energy_price"
+RATE_ID = "TEST-TEST-TEST-TEST"
+
+
+def test_rate_round_trip() -> None:
+    """Test a rate comes back from storage the same as it went in."""
+    rate = make_rate_info(RATE_ID)
+    fetched_at = dt_util.utcnow()
+
+    restored, restored_fetched_at = rate_from_store(rate_to_store(rate, fetched_at))
+
+    assert restored == rate
+    assert restored_fetched_at == fetched_at
+
+
+async def test_rates_saved_after_refresh(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    mock_rate_data: AsyncMock,  # noqa: ARG001
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the fetched rates are written to storage."""
+    freezer.move_to("2025-01-01T02:50:00+00:00")
+    mock_config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(seconds=STORAGE_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    stored = hass_storage[f"midas.{mock_config_entry.entry_id}.rates"]
+    assert stored["version"] == STORAGE_VERSION
+    rate, fetched_at = rate_from_store(stored["data"]["rates"][RATE_ID])
+    assert rate == make_rate_info(RATE_ID)
+    assert fetched_at == dt_util.parse_datetime("2025-01-01T02:50:00+00:00")
+
+
+async def test_setup_serves_saved_rates(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    mock_config_entry: MockConfigEntry,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test setup doesn't wait on the server when there are saved rates."""
+    freezer.move_to("2025-01-01T02:50:00+00:00")
+    fetched_at = dt_util.parse_datetime("2025-01-01T01:00:00+00:00")
+    hass_storage[f"midas.{mock_config_entry.entry_id}.rates"] = {
+        "version": STORAGE_VERSION,
+        "key": f"midas.{mock_config_entry.entry_id}.rates",
+        "data": {"rates": {RATE_ID: rate_to_store(make_rate_info(), fetched_at)}},
+    }
+    server_responded = asyncio.Event()
+
+    async def slow_rate_data(rate_id: str) -> RateInfo:
+        await server_responded.wait()
+        return make_rate_info(rate_id)
+
+    mock_config_entry.add_to_hass(hass)
+    with patch(
+        "custom_components.midas.api.IntegrationMidasApiClient.async_get_rate_data",
+        side_effect=slow_rate_data,
+    ):
+        await hass.config_entries.async_setup(mock_config_entry.entry_id)
+
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        state = hass.states.get(CURRENT_PRICE)
+        assert state.state == "0.12"
+        assert state.attributes["data_fetched_at"] == fetched_at
+
+        server_responded.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    state = hass.states.get(CURRENT_PRICE)
+    assert state.attributes["data_fetched_at"] == dt_util.utcnow()
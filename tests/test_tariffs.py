@@ -0,0 +1,111 @@
+"""Test the MIDAS tariff index."""
+
+# ruff: noqa: S101
+
+import time
+from datetime import UTC, datetime, timedelta
+
+from custom_components.midas.tariffs import TariffIndex, rate_fingerprint
+
+from .common import make_rate_info, make_tariff
+
+START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+def test_index_matches_get_active_tariffs() -> None:
+    """Test the index returns the same tariffs as a full scan, including boundaries."""
+    rate = make_rate_info(start=START, count=96, step=timedelta(minutes=15))
+    index = TariffIndex(rate)
+    assert len(index) == len(rate.ValueInformation)
+
+    moment = START - timedelta(hours=1)
+    while moment < START + timedelta(days=1, hours=1):
+        assert index.active_tariffs(moment) == rate.GetActiveTariffs(moment)
+        moment += timedelta(minutes=5)
+
+
+def test_index_overlapping_and_unsorted_tariffs() -> None:
+    """Test overlapping, out of order and gapped tariffs resolve like a full scan."""
+    rate = make_rate_info(
+        tariffs=[
+            make_tariff(START + timedelta(hours=4), START + timedelta(hours=6), 0.3),
+            make_tariff(START, START + timedelta(hours=24), 0.1, "All Day"),
+            make_tariff(START + timedelta(hours=1), START + timedelta(hours=2), 0.2),
+            make_tariff(START + timedelta(days=2), START + timedelta(days=3), 0.4),
+        ]
+    )
+    index = TariffIndex(rate)
+
+    moment = START - timedelta(hours=1)
+    while moment < START + timedelta(days=4):
+        assert index.active_tariffs(moment) == rate.GetActiveTariffs(moment)
+        moment += timedelta(minutes=30)
+
+    assert index.active_tariff(START + timedelta(hours=5)).value == 0.3  # noqa: PLR2004
+    assert index.active_tariff(START + timedelta(days=1, hours=12)) is None
+
+
+def test_index_schedule() -> None:
+    """Test the schedule has every tariff overlapping the window, sorted by start."""
+    rate = make_rate_info(
+        tariffs=[
+            make_tariff(START + timedelta(hours=4), START + timedelta(hours=6), 0.3),
+            make_tariff(START, START + timedelta(hours=24), 0.1, "All Day"),
+            make_tariff(START + timedelta(hours=1), START + timedelta(hours=2), 0.2),
+            make_tariff(START + timedelta(days=2), START + timedelta(days=3), 0.4),
+        ]
+    )
+    index = TariffIndex(rate)
+
+    schedule = index.schedule(START + timedelta(hours=2), START + timedelta(days=2))
+    assert schedule == (
+        (START, START + timedelta(hours=24), 0.1, "All Day"),
+        (START + timedelta(hours=4), START + timedelta(hours=6), 0.3, "Tariff"),
+    )
+    assert index.schedule(START + timedelta(days=3), START + timedelta(days=4)) == ()
+
+
+def test_index_faster_than_scan() -> None:
+    """Benchmark the index against `GetActiveTariffs` on a week of 5 minute tariffs."""
+    rate = make_rate_info(start=START, count=2016, step=timedelta(minutes=5))
+    index = TariffIndex(rate)
+    moments = [START + timedelta(minutes=7 * i) for i in range(100)]
+
+    begin = time.perf_counter()
+    for moment in moments:
+        rate.GetActiveTariffs(moment)
+    scan_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    for moment in moments:
+        index.active_tariffs(moment)
+    index_time = time.perf_counter() - begin
+
+    assert index_time * 10 < scan_time
+
+
+def test_index_next_boundary() -> None:
+    """Test finding the next instant the active tariffs change."""
+    rate = make_rate_info(
+        tariffs=[
+            make_tariff(START, START + timedelta(hours=1), 0.1),
+            make_tariff(START + timedelta(hours=2), START + timedelta(hours=3), 0.2),
+        ]
+    )
+    index = TariffIndex(rate)
+
+    assert index.next_boundary(START - timedelta(hours=1)) == START
+    assert index.next_boundary(START) == START + timedelta(hours=1)
+    assert index.next_boundary(START + timedelta(hours=1)) == START + timedelta(hours=2)
+    assert index.next_boundary(START + timedelta(hours=3)) is None
+
+
+def test_rate_fingerprint() -> None:
+    """Test the fingerprint only changes when the tariffs do."""
+    fingerprint = rate_fingerprint(make_rate_info(start=START))
+
+    assert rate_fingerprint(make_rate_info(start=START)) == fingerprint
+    assert rate_fingerprint(make_rate_info(start=START, count=25)) != fingerprint
+    changed = make_rate_info(start=START)
+    changed.ValueInformation[3].value = 0.5
+    assert rate_fingerprint(changed) != fingerprint